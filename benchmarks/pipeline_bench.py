@@ -0,0 +1,207 @@
+"""Stage-by-stage timings of the multi-file ingest pipeline.
+
+Synthesises N monthly reports from the bundled demo .xls files and times
+each stage of the path from upload to download separately:
+
+- parse: opening each workbook with the app's .xls reader and loading its sheet;
+- extract: scanning the sheet and pulling out the room-type metrics;
+- store: building the columnar trend store and its DataFrame;
+- charts: building the chart datasets and Vega-Lite specs of one property by
+  room type and of every property compared;
+- analytics: seasonal baselines, unusual months and forecasts of every
+  (property, room type) series;
+- export: writing the trends workbook (as the download button does).
+
+Wall time and peak traced memory of every stage are recorded; memory is
+measured in a second, traced pass so tracing doesn't skew the timings.
+
+The demo files are cycled as-is, so every synthetic report goes through the
+real parser. Each report gets its own property/month (120 months per
+synthetic property) and its metrics are scaled by a seeded random factor,
+so the later stages see as many distinct values as real uploads would.
+
+    python benchmarks/pipeline_bench.py --reports 10 100 1000 --save benchmarks/baseline.json
+    python benchmarks/pipeline_bench.py --reports 10 100 1000 --compare benchmarks/baseline.json
+"""
+
+import argparse
+import dataclasses
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from room_pop.analytics import SeriesAnalysis  # noqa: E402
+from room_pop.charts import chart_dataset, property_chart_dataset, trend_bar_chart  # noqa: E402
+from room_pop.export import trends_bytes  # noqa: E402
+from room_pop.extract import extract_cells  # noqa: E402
+from room_pop.ingest import IngestResult  # noqa: E402
+from room_pop.readers import open_xls  # noqa: E402
+from room_pop.store import METRIC_COLUMNS, MetricsStore  # noqa: E402
+
+STAGES = ("parse", "extract", "store", "charts", "analytics", "export")
+MONTHS_PER_PROPERTY = 120
+# Workbooks held open at once between the parse and extract stages
+BATCH = 50
+# Slowdowns smaller than this are timer noise, whatever the ratio
+NOISE_SECONDS = 0.05
+
+
+def synthesize(n, seed=0):
+    """``n`` ``(filename, property, date, data)`` reports cycled from the demo files."""
+    templates = [open(path, "rb").read() for path in sorted(glob.glob(os.path.join(ROOT, "*Room_Type_Popularity.xls")))]
+    months = pd.date_range("2015-01-01", periods=MONTHS_PER_PROPERTY, freq="MS").strftime("%Y-%m")
+    reports = []
+    for i in range(n):
+        prop, month = f"Synthetic Property {i // MONTHS_PER_PROPERTY + 1}", months[i % MONTHS_PER_PROPERTY]
+        reports.append((f"{month} Room_Type_Popularity.xls", prop, month, templates[i % len(templates)]))
+    return reports
+
+
+def _jitter(metrics, prop, rng):
+    """``metrics`` of another property: rentals and revenue scaled by one random factor."""
+    factor = rng.uniform(0.7, 1.3)
+    rentals = np.round(np.asarray(metrics.rentals) * factor)
+    revenue = np.round(np.asarray(metrics.revenue) * factor, 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adr = np.where(rentals > 0, np.round(revenue / rentals, 2), 0.0)
+    return dataclasses.replace(
+        metrics, rentals=tuple(rentals), revenue=tuple(revenue), adr=tuple(adr), property_name=prop,
+    )
+
+
+def run_pipeline(reports, trace=False, seed=0):
+    """``{stage: {"seconds", "peak_bytes"}}`` for one run over ``reports``."""
+    stats = {stage: {"seconds": 0.0, "peak_bytes": 0} for stage in STAGES}
+
+    @contextmanager
+    def stage(name):
+        if trace:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        yield
+        stats[name]["seconds"] += time.perf_counter() - start
+        if trace:
+            stats[name]["peak_bytes"] = max(stats[name]["peak_bytes"], tracemalloc.get_traced_memory()[1] - base)
+
+    rng = np.random.default_rng(seed)
+    results = []
+    for begin in range(0, len(reports), BATCH):
+        batch = reports[begin:begin + BATCH]
+        # The same reader and extraction read_report runs, split into their two stages
+        with ExitStack() as books:
+            with stage("parse"):
+                sheets = [books.enter_context(open_xls(data)) for _, _, _, data in batch]
+            with stage("extract"):
+                extracted = [extract_cells(sheet) for sheet in sheets]
+        del sheets
+        for (filename, prop, month, _), metrics in zip(batch, extracted):
+            results.append(IngestResult(filename, month, _jitter(metrics, prop, rng), key=f"{prop}/{month}"))
+
+    with stage("store"):
+        store = MetricsStore.from_results(results)
+        store.to_frame()
+    with stage("charts"):
+        properties = store.property_names()
+        frame, bucket = chart_dataset(store, property_name=properties[0])
+        compared, _ = property_chart_dataset(store, properties, bucket)
+        for metric in METRIC_COLUMNS.values():
+            trend_bar_chart(frame, metric, metric, ",.2f", bucket).to_dict(validate=False)
+            trend_bar_chart(compared, metric, metric, ",.2f", bucket, x="Period", series="Property").to_dict(validate=False)
+    with stage("analytics"):
+        analysis = SeriesAnalysis(store)
+        analysis.anomalies()
+        analysis.forecast()
+    with stage("export"):
+        trends_bytes(store, "xlsx")
+    return stats
+
+
+def measure(n, repeat):
+    reports = synthesize(n)
+    runs = [run_pipeline(reports) for _ in range(repeat)]
+    tracemalloc.start()
+    try:
+        traced = run_pipeline(reports, trace=True)
+    finally:
+        tracemalloc.stop()
+    return {
+        stage: {
+            "seconds": min(run[stage]["seconds"] for run in runs),
+            "peak_bytes": traced[stage]["peak_bytes"],
+        }
+        for stage in STAGES
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print the change against ``baseline``; True if any stage got slower than ``tolerance`` allows."""
+    regressed = False
+    for n, stages in results.items():
+        base_stages = baseline.get("results", {}).get(n)
+        if base_stages is None:
+            print(f"{n} reports: not in the baseline")
+            continue
+        for stage, now in stages.items():
+            if stage not in base_stages:
+                print(f"{n:>6} reports {stage:<9} not in the baseline")
+                continue
+            before = base_stages[stage]["seconds"]
+            ratio = now["seconds"] / before if before else 1.0
+            flag = ""
+            if ratio > 1 + tolerance and now["seconds"] - before > NOISE_SECONDS:
+                flag, regressed = "  <-- slower", True
+            print(f"{n:>6} reports {stage:<9} {before * 1e3:9.1f} ms -> {now['seconds'] * 1e3:9.1f} ms  ({ratio:5.2f}x){flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, nargs="+", default=[10, 100, 1000],
+                        help="numbers of synthetic reports to run (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size; the fastest is kept (default: %(default)s)")
+    parser.add_argument("--save", help="write the results to this JSON baseline")
+    parser.add_argument("--compare", help="compare against this JSON baseline; exit 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before --compare fails, as a fraction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    # Warm-up, so one-off import and schema loading costs stay out of the first size
+    run_pipeline(synthesize(2))
+
+    results = {}
+    for n in args.reports:
+        results[str(n)] = stages = measure(n, args.repeat)
+        total = sum(stage["seconds"] for stage in stages.values())
+        print(f"{n} reports: {total:.2f} s")
+        for stage, values in stages.items():
+            print(f"  {stage:<9} {values['seconds'] * 1e3:9.1f} ms   peak {values['peak_bytes'] / 2**20:8.1f} MB")
+
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+                "results": results,
+            }, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
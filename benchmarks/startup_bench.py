@@ -0,0 +1,103 @@
+"""Startup and rerun timings of the Streamlit app.
+
+Runs the app headlessly with Streamlit's AppTest and reports:
+
+- cold start: first script run in a fresh interpreter (imports included),
+  plus which heavy libraries that first run pulled in;
+- warm reruns of each view, empty and with the demo files loaded.
+
+    python benchmarks/startup_bench.py --repeat 5 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "rm_pop_for_st.py")
+SINGLE = "Single Room Pop Excel File Analysis"
+MULTI = "Multi Room Pop Excel File Analysis by Date"
+HEAVY_MODULES = ("pandas", "numpy", "altair", "xlrd", "xlsxwriter")
+
+_COLD_START = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+start = time.perf_counter()
+at.run()
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def cold_start():
+    code = _COLD_START.format(root=ROOT, app=APP, heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return time.perf_counter() - start
+
+
+def _click(at, label):
+    next(button for button in at.button if button.label == label).click()
+    return _timed_run(at)
+
+
+def warm_reruns(repeat):
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    timings = {}
+
+    def measure(name, view):
+        at.session_state["active_view"] = view
+        timings[name] = [_timed_run(at) for _ in range(repeat)]
+
+    measure("single view, empty", SINGLE)
+    measure("multi view, empty", MULTI)
+
+    at.session_state["active_view"] = MULTI
+    at.run()
+    timings["multi view, load demo files"] = [_click(at, "📂 Use Demo Files")]
+    timings["multi view, generate graphs"] = [_click(at, "⚙️ Generate Graphs") for _ in range(repeat)]
+    measure("multi view, demo loaded", MULTI)
+    measure("single view, multi data loaded", SINGLE)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="reruns per scenario (default: %(default)s)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)  # the demo files are opened by relative path
+    cold = cold_start()
+    reruns = warm_reruns(args.repeat)
+
+    print(f"cold start: {cold['seconds'] * 1e3:8.1f} ms   (loaded: {', '.join(cold['loaded']) or 'none'})")
+    for name, samples in reruns.items():
+        print(f"{name:<32} median {statistics.median(samples) * 1e3:8.1f} ms   min {min(samples) * 1e3:8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"cold_start": cold, "reruns": reruns}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
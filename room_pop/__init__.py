@@ -0,0 +1,6 @@
+"""Helpers behind the Room Type Popularity Streamlit app.
+
+The Streamlit script (``rm_pop_for_st.py``) only draws widgets; reading the
+Visual Matrix reports and pulling the room-type figures out of them lives here
+so it can be cached and reused.
+"""
@@ -0,0 +1,196 @@
+"""Content-hashed cache of extracted report metrics.
+
+Reports are keyed by the SHA-256 of their bytes, so re-uploading the same
+monthly file (under any name), rerunning the Streamlit script or opening it
+from another session never parses the workbook again. Only the small
+extracted metrics are kept, never the full DataFrame.
+
+Entries live in an in-memory LRU bounded by entry count and by approximate
+size, optionally expire after ``ttl`` seconds and, if ``disk_dir`` is given,
+are also written to a pickle-per-report directory that survives server
+restarts. One instance is meant to be shared by every session of the server,
+so all bookkeeping is thread-safe, and a report that is already being parsed
+is never parsed a second time: ``claim`` hands later callers the running
+parse's future instead.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from .extract import EXTRACT_VERSION, read_report
+
+
+def content_key(data):
+    """Hex SHA-256 of the raw file bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    def __init__(self, max_entries=256, disk_dir=None, ttl=None, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = None
+        if disk_dir:
+            # Results of different extractor versions never mix
+            self.disk_dir = os.path.join(disk_dir, f"v{EXTRACT_VERSION}")
+            os.makedirs(self.disk_dir, exist_ok=True)
+        self._entries = OrderedDict()  # key -> (value, size in bytes, stored at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> Future of the parse running for that key
+        self._counters = dict.fromkeys(("hits", "disk_hits", "misses", "evictions", "expirations"), 0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries or (self.disk_dir is not None and os.path.exists(self._disk_path(key)))
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _expired(self, stored_at):
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def _remember(self, key, value, size, stored_at):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size, stored_at)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes and len(self._entries) > 1)
+            ):
+                self._bytes -= self._entries.popitem(last=False)[1][1]
+                self._counters["evictions"] += 1
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _lookup(self, key):
+        """``(value, counter)`` for ``key``; counter is "hits", "disk_hits" or "misses"."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[2]):
+                    self._entries.move_to_end(key)
+                    return entry[0], "hits"
+                self._bytes -= self._entries.pop(key)[1]
+                self._counters["expirations"] += 1
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            try:
+                stored_at = os.path.getmtime(path)
+                if not self._expired(stored_at):
+                    with open(path, "rb") as fh:
+                        raw = fh.read()
+                    value = pickle.loads(raw)
+                    self._remember(key, value, len(raw), stored_at)
+                    return value, "disk_hits"
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+        return None, "misses"
+
+    def get(self, key):
+        """Return the cached metrics for ``key`` or ``None``."""
+        value, counter = self._lookup(key)
+        self._count(counter)
+        return value
+
+    def put(self, key, value):
+        raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, value, len(raw), time.time())
+        if self.disk_dir is None:
+            return
+        # Write to a temp file first so a crash never leaves a truncated entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(raw)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def clear(self):
+        """Drop the in-memory entries (the disk tier is left alone) and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def stats(self):
+        """Counters and current size, for the admin panel."""
+        with self._lock:
+            stats = dict(self._counters, entries=len(self._entries), bytes=self._bytes)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def claim(self, key):
+        """Reserve the parse of ``key``, or join the one already running.
+
+        Returns ``(future, owner)``. The owner must parse the report and pass
+        the outcome to ``settle``; every other caller waits on ``future``,
+        which ends with the metrics or with the parse's exception. On a hit
+        the future is already done.
+        """
+        value, counter = self._lookup(key)
+        if value is None:
+            with self._lock:
+                future = self._inflight.get(key)
+                if future is not None:
+                    self._counters["hits"] += 1
+                    return future, False
+                future = self._inflight[key] = Future()
+            # Another parse may have finished between the lookup and the claim
+            value, counter = self._lookup(key)
+            if value is None:
+                self._count("misses")
+                return future, True
+            with self._lock:
+                del self._inflight[key]
+            future.set_result(value)
+        else:
+            future = Future()
+            future.set_result(value)
+        self._count(counter)
+        return future, False
+
+    def settle(self, key, value=None, error=None):
+        """End the owner's parse of ``key`` with its metrics, or with the exception ``error``."""
+        if error is None:
+            self.put(key, value)
+        with self._lock:
+            future = self._inflight.pop(key)
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+
+    def get_or_parse(self, data, parse=read_report):
+        """Return the metrics for the report bytes ``data``, parsing only on a miss.
+
+        Sessions asking for the same uncached report at the same time wait for
+        a single parse instead of each running their own.
+        """
+        key = content_key(data)
+        future, owner = self.claim(key)
+        if not owner:
+            return future.result()
+        try:
+            value = parse(data)
+        except BaseException as e:
+            self.settle(key, error=e)
+            raise
+        self.settle(key, value)
+        return value
@@ -0,0 +1,75 @@
+"""Compact, pre-aggregated data behind the Altair trend charts.
+
+Every chart used to embed the whole long table (both date columns and all
+four metrics) in its Vega-Lite spec. The charts now share one small table
+with a ``Period`` label, ``Room Type`` and the metrics, and each chart sends
+only its own metric column. Past ``MAX_CHART_PERIODS`` months the months are
+bucketed into quarters, then years, so the payload stops growing with history.
+
+With several properties, ``property_chart_dataset`` compares them on their
+all-room-types totals instead.
+"""
+
+import numpy as np
+
+from .rollup import GRAINS, period_ordinals
+from .store import METRIC_COLUMNS
+
+# Most periods plotted side by side before switching to a coarser bucket
+MAX_CHART_PERIODS = 24
+
+
+def chart_bucket(dates, max_periods=MAX_CHART_PERIODS):
+    """Finest grain that keeps the number of periods within ``max_periods``."""
+    for grain in GRAINS:
+        if len(np.unique(period_ordinals(dates, grain))) <= max_periods:
+            return grain
+    return GRAINS[-1]
+
+
+def chart_dataset(store, bucket=None, max_periods=MAX_CHART_PERIODS, property_name=None):
+    """``(frame, bucket)`` shared by the four trend charts.
+
+    ``frame`` is the store's rollup at ``bucket`` (picked from ``max_periods``
+    when not given): one row per period and room type with ``Period``,
+    ``Room Type`` and the metric columns. ``property_name`` picks one
+    property of a multi-property store.
+    """
+    bucket = bucket or chart_bucket(store.date, max_periods)
+    frame = store.rollup_cube().table(bucket, None if property_name is None else [property_name])
+    return frame[["Period", "Room Type", *METRIC_COLUMNS.values()]], bucket
+
+
+def property_chart_dataset(store, property_names, bucket=None, max_periods=MAX_CHART_PERIODS):
+    """``(frame, bucket)`` comparing ``property_names``: one row per property and period with all room types totalled."""
+    bucket = bucket or chart_bucket(store.date, max_periods)
+    frame = store.rollup_cube().property_table(bucket, property_names)
+    return frame[["Property", "Period", *METRIC_COLUMNS.values()]], bucket
+
+
+def trend_bar_chart(frame, metric, title, value_format, bucket="month", x="Room Type", series="Period"):
+    """Grouped bar chart of one metric: ``x`` groups on the axis, one bar per ``series`` value within each.
+
+    Room types by period by default; properties by period for ``x="Period", series="Property"``.
+    """
+    import altair as alt
+
+    # Each chart embeds only the columns it encodes
+    return alt.Chart(frame[[x, series, metric]]).mark_bar().encode(
+        # Primary X-axis: Room Type (or period)
+        x=alt.X(f'{x}:N', axis=alt.Axis(title=x)),
+        # Offset bars within each group by the series
+        xOffset=alt.XOffset(f'{series}:N'),
+        # Y-axis: The metric value
+        y=alt.Y(f'{metric}:Q', axis=alt.Axis(title=metric)),
+        # Color bars by the series to tell them apart
+        color=alt.Color(f'{series}:N', legend=alt.Legend(title=bucket.capitalize() if series == "Period" else series)),
+        tooltip=[x, series, alt.Tooltip(metric, format=value_format)]
+    ).properties(
+        title=title
+    )
+
+
+def payload_bytes(chart):
+    """Approximate size of a chart sent to the browser: its Vega-Lite spec with the data inlined."""
+    return len(chart.to_json(validate=False))
@@ -0,0 +1,125 @@
+"""Command-line entry point: build the trends workbook without Streamlit.
+
+    python -m room_pop "reports/*Room_Type_Popularity.xls" -o Multi_File_Room_Trends_Report.xlsx
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+from .cache import ParseCache
+from .export import EXPORT_FORMATS, write_trends
+from .history import HistoryStore
+from .ingest import (
+    DEFAULT_EXECUTOR,
+    DEFAULT_WORKERS,
+    NO_DATE,
+    IngestProblem,
+    dedupe_periods,
+    describe_dropped,
+    group_by_property,
+    ingest_reports,
+    iter_ingest,
+    property_from_filename,
+    track_peak_memory,
+)
+from .period import REPORT, Period, describe_conflict, find_conflicts
+from .store import MetricsStore
+
+
+def _expand(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) or ([pattern] if os.path.isfile(pattern) else [])
+        paths.extend(path for path in matches if path not in paths)
+    return paths
+
+
+def _read_files(paths):
+    for path in paths:
+        with open(path, "rb") as fh:
+            yield os.path.basename(path), fh.read()
+
+
+def _file_loaders(paths):
+    for path in paths:
+        def load(path=path):
+            with open(path, "rb") as fh:
+                return fh.read()
+        yield os.path.basename(path), load
+
+
+def _stream(paths, cache):
+    results, problems = [], []
+    for outcome in iter_ingest(_file_loaders(paths), cache=cache):
+        (problems if isinstance(outcome, IngestProblem) else results).append(outcome)
+    results.sort(key=lambda result: result.period)
+    return results, problems
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m room_pop",
+        description="Turn Room_Type_Popularity reports into the multi-file trends workbook.",
+    )
+    parser.add_argument("patterns", nargs="+", help="report files or glob patterns (quote globs)")
+    parser.add_argument("-o", "--output", default="Multi_File_Room_Trends_Report.xlsx",
+                        help="output file (default: %(default)s)")
+    parser.add_argument("-f", "--format", choices=EXPORT_FORMATS,
+                        help="output format (default: from the output file extension)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help="parallel parse workers (default: %(default)s)")
+    parser.add_argument("--executor", choices=("thread", "process"), default=DEFAULT_EXECUTOR,
+                        help="worker pool type (default: %(default)s)")
+    parser.add_argument("--stream", action="store_true",
+                        help="read and parse one file at a time to bound memory (ignores --workers)")
+    parser.add_argument("--cache-dir", default=os.environ.get("ROOM_POP_CACHE_DIR"),
+                        help="reuse extracted metrics from this directory across runs")
+    parser.add_argument("--history-db", default=os.environ.get("ROOM_POP_HISTORY_DB"),
+                        help="also upsert the months into this SQLite history file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    paths = _expand(args.patterns)
+    if not paths:
+        print("No report files matched.", file=sys.stderr)
+        return 2
+
+    # Clashing periods are spotted from the filenames alone, before any parsing
+    names = [os.path.basename(path) for path in paths]
+    properties = {name: property_from_filename(name) for name in names}
+    for kind, clashing in find_conflicts({name: Period.parse(name) for name in names}, properties):
+        print(f"warning: {describe_conflict(kind, clashing)}", file=sys.stderr)
+
+    cache = ParseCache(disk_dir=args.cache_dir) if args.cache_dir else None
+    if args.stream:
+        with track_peak_memory() as memory:
+            results, problems = _stream(paths, cache)
+        print(f"Peak memory while ingesting: {memory['peak_bytes'] / 2**20:.1f} MB", file=sys.stderr)
+    else:
+        results, problems = ingest_reports(_read_files(paths), cache=cache, workers=args.workers, executor=args.executor)
+    for problem in problems:
+        if problem.kind == NO_DATE:
+            print(f"warning: could not find a date in the filename or report: {problem.filename}", file=sys.stderr)
+        else:
+            print(f"error: could not read {problem.filename}: {problem.message}", file=sys.stderr)
+    for result in results:
+        if result.date_source == REPORT:
+            print(f"warning: no date in the filename {result.filename}; using the period in the report {result.date}", file=sys.stderr)
+    if not results:
+        print("No reports could be read.", file=sys.stderr)
+        return 1
+    results, dropped = dedupe_periods(results)
+    for result, kept in dropped:
+        print(f"warning: {describe_dropped(result, kept)}", file=sys.stderr)
+
+    if args.history_db:
+        HistoryStore(args.history_db).upsert(results)
+
+    write_trends(MetricsStore.from_results(results), args.output, args.format)
+    properties = len(group_by_property(results))
+    print(f"Wrote {len(results)} reports" + (f" for {properties} properties" if properties > 1 else "") + f" to {args.output}")
+    return 0
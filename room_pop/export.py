@@ -0,0 +1,139 @@
+"""Write the analysis tables out as Excel, CSV, Parquet or a ZIP of CSVs."""
+
+import csv
+import io
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from .store import METRIC_COLUMNS, TREND_SHEETS
+
+EXPORT_FORMATS = ("xlsx", "csv", "parquet", "zip")
+
+# Download name and MIME type of each trends export format
+EXPORT_FILES = {
+    "xlsx": ("Multi_File_Room_Trends_Report.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("Multi_File_Room_Trends_Report.csv", "text/csv"),
+    "parquet": ("Multi_File_Room_Trends_Report.parquet", "application/vnd.apache.parquet"),
+    "zip": ("Multi_File_Room_Trends_Report.zip", "application/zip"),
+}
+
+# Same look as the header row pandas writes
+_HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+
+# Rows turned into Python objects at a time by _rows
+_CHUNK_ROWS = 4096
+
+
+def excel_bytes(dfs_dict):
+    """In-memory .xlsx with one sheet per ``{sheet name: DataFrame}`` entry."""
+    output = io.BytesIO()
+    # Use pandas ExcelWriter to write multiple sheets
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        for sheet_name, df_to_write in dfs_dict.items():
+            # index=False prevents pandas from writing the DataFrame index as a column
+            df_to_write.to_excel(writer, sheet_name=sheet_name, index=False)
+    return output.getvalue()
+
+
+def format_from_path(path):
+    """Export format implied by a file extension, defaulting to xlsx."""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return ext if ext in EXPORT_FORMATS else "xlsx"
+
+
+def _cells(values):
+    """Column values as Python objects, with NaN as ``None`` (written as an empty cell)."""
+    if values.dtype.kind == "f":
+        missing = np.isnan(values)
+        if missing.any():
+            values = values.astype(object)
+            values[missing] = None
+    return values.tolist()
+
+
+def _rows(columns):
+    """Rows of ``{column name: values}`` as tuples, ``_CHUNK_ROWS`` rows converted at a time.
+
+    Only one chunk of each column is ever held as Python objects, so memory
+    stays flat however long the table is.
+    """
+    arrays = [np.asarray(values) for values in columns.values()]
+    n_rows = len(arrays[0]) if arrays else 0
+    for start in range(0, n_rows, _CHUNK_ROWS):
+        yield from zip(*(_cells(values[start:start + _CHUNK_ROWS]) for values in arrays))
+
+
+def _trend_tables(store):
+    """``{sheet name: {column name: values}}`` of the four trend sheets."""
+    columns = store.columns()
+    ids = {name: values for name, values in columns.items() if name not in METRIC_COLUMNS.values()}
+    return {
+        sheet: {**ids, METRIC_COLUMNS[column]: columns[METRIC_COLUMNS[column]]}
+        for column, sheet in TREND_SHEETS.items()
+    }
+
+
+def write_xlsx(tables, output):
+    """Write ``{sheet name: {column name: values}}`` as an .xlsx workbook to ``output``.
+
+    Rows go from the column arrays to xlsxwriter a chunk at a time, in
+    constant_memory mode, which flushes each row to disk as soon as the next
+    one starts, so neither a DataFrame nor the whole sheet is ever held in memory.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+    header = workbook.add_format(_HEADER_FORMAT)
+    for sheet_name, columns in tables.items():
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, list(columns), header)
+        for row, values in enumerate(_rows(columns), start=1):
+            worksheet.write_row(row, 0, values)
+    workbook.close()
+
+
+def _write_csv(fh, columns):
+    """Write ``{column name: values}`` as CSV text to the binary file ``fh``."""
+    text = io.TextIOWrapper(fh, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    writer.writerows(_rows(columns))
+    text.flush()
+    text.detach()
+
+
+def write_trends(store, output, fmt=None):
+    """Write a ``MetricsStore`` to ``output``, a path or a binary file object.
+
+    xlsx gives the same four-sheet workbook as the app's download button and
+    zip gives those four sheets as CSV files; csv and parquet give a single
+    long table with every metric as a column.
+    """
+    if fmt is None:
+        fmt = format_from_path(output) if isinstance(output, str) else "xlsx"
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+    if fmt == "xlsx":
+        write_xlsx(_trend_tables(store), output)
+    elif fmt == "parquet":
+        pd.DataFrame(store.columns()).to_parquet(output, index=False)
+    elif isinstance(output, str):
+        with open(output, "wb") as fh:
+            write_trends(store, fh, fmt)
+    elif fmt == "csv":
+        _write_csv(output, store.columns())
+    else:
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+            for sheet_name, columns in _trend_tables(store).items():
+                with archive.open(f"{sheet_name}.csv", "w") as member:
+                    _write_csv(member, columns)
+
+
+def trends_bytes(store, fmt="xlsx"):
+    """In-memory export of a ``MetricsStore`` in ``fmt``, for download buttons."""
+    output = io.BytesIO()
+    write_trends(store, output, fmt)
+    return output.getvalue()
@@ -0,0 +1,95 @@
+"""Pull the room-type figures out of a Room_Type_Popularity report.
+
+Only the room-type subtotal rows and the grand totals row of a report are
+ever used, so no DataFrame is built: ``readers`` opens the file in whatever
+format it is (.xls, .xlsx, CSV or Parquet) and just those cells are read.
+"""
+
+import time
+from dataclasses import dataclass
+
+from .layout import DEFAULT_LAYOUT, printed_date, property_name, report_range, scan_rows
+from .money import parse_money_array
+from .period import Period
+from .readers import open_report
+
+# Bump whenever the shape or meaning of the extracted metrics changes so that
+# cached results written by an older version are not reused.
+EXTRACT_VERSION = 6
+
+
+@dataclass(frozen=True)
+class ReportMetrics:
+    """The figures of one report, one entry per room type in ``room_types`` order."""
+
+    room_types: tuple
+    rentals: tuple
+    percents: tuple
+    revenue: tuple
+    adr: tuple
+    total_rentals: float
+    total_percent: float
+    total_revenue: float
+    total_adr: float
+    property_name: str = ""
+    printed_on: str = ""  # "YYYY-MM-DD" print date from the header, if any; for display only
+    period: str = ""  # label of the period the report says it covers, if any
+
+    def by_room_type(self, field):
+        """``{room type: value}`` for one of the per-room-type fields."""
+        return dict(zip(self.room_types, getattr(self, field)))
+
+    def totals(self):
+        return {
+            "rm tot": self.total_rentals,
+            "% tot": self.total_percent,
+            "rev tot": self.total_revenue,
+            "adr tot": self.total_adr,
+        }
+
+
+def _extract(cell, labels, subtotals, layout):
+    """Build a ``ReportMetrics`` from ``cell(row, col)`` in worksheet coordinates."""
+    header = cell(*layout.property_cell)
+    covered = report_range(cell(*layout.period_cell))
+    index = scan_rows(labels, subtotals, layout)
+    rows = index.rows + (index.totals_row,)
+    # Parse every cell used in one vectorised pass: one row per room type plus totals
+    values = parse_money_array([[cell(row, col) for col in layout.metric_cols] for row in rows])
+    rentals, percents, revenue, adr = (tuple(column[:-1].tolist()) for column in values.T)
+    total_rentals, total_percent, total_revenue, total_adr = values[-1].tolist()
+    return ReportMetrics(
+        room_types=index.room_types,
+        rentals=rentals,
+        percents=percents,
+        revenue=revenue,
+        adr=adr,
+        total_rentals=total_rentals,
+        total_percent=total_percent,
+        total_revenue=total_revenue,
+        total_adr=total_adr,
+        property_name=property_name(header),
+        printed_on=printed_date(header),
+        period=Period.from_range(*covered).label if covered else "",
+    )
+
+
+def extract_cells(sheet, layout=DEFAULT_LAYOUT):
+    """Extract the metrics from the ``readers.SheetCells`` of any report format."""
+    return _extract(sheet.cell, sheet.labels, sheet.subtotals, layout)
+
+
+def read_report(data, layout=DEFAULT_LAYOUT, timings=None):
+    """Parse the raw bytes of an uploaded report, in any format ``readers`` knows, and extract its metrics.
+
+    If ``timings`` is a dict, the seconds spent opening the workbook and
+    extracting the metrics are stored in it under ``"parse"`` and ``"extract"``.
+    """
+    start = time.perf_counter()
+    with open_report(data, layout) as sheet:
+        parsed = time.perf_counter()
+        metrics = extract_cells(sheet, layout)
+    if timings is not None:
+        timings["parse"] = parsed - start
+        timings["extract"] = time.perf_counter() - parsed
+    return metrics
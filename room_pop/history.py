@@ -0,0 +1,141 @@
+"""Local SQLite history of extracted monthly metrics.
+
+Every ingested report is upserted by (property, period), so past months can
+be charted without re-uploading their workbooks. The database is a single
+file and each call opens its own connection, which keeps it safe to share
+between Streamlit sessions running on different threads.
+"""
+
+import sqlite3
+from contextlib import closing
+
+from .extract import ReportMetrics
+from .ingest import IngestResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    property TEXT NOT NULL,
+    period TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    total_rentals REAL,
+    total_percent REAL,
+    total_revenue REAL,
+    total_adr REAL,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (property, period)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    property TEXT NOT NULL,
+    period TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    room_type TEXT NOT NULL,
+    rentals REAL,
+    percent REAL,
+    revenue REAL,
+    adr REAL,
+    PRIMARY KEY (property, period, room_type)
+);
+CREATE INDEX IF NOT EXISTS reports_by_hash ON reports (content_hash);
+"""
+
+
+class HistoryStore:
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def upsert(self, results):
+        """Insert or replace the months of ``results``; returns how many were written."""
+        results = list(results)
+        with closing(self._connect()) as conn, conn:
+            for result in results:
+                m = result.metrics
+                conn.execute(
+                    "INSERT OR REPLACE INTO reports (property, period, filename, content_hash,"
+                    " total_rentals, total_percent, total_revenue, total_adr)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (m.property_name, result.date, result.filename, result.key,
+                     m.total_rentals, m.total_percent, m.total_revenue, m.total_adr),
+                )
+                conn.execute("DELETE FROM metrics WHERE property = ? AND period = ?", (m.property_name, result.date))
+                conn.executemany(
+                    "INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (m.property_name, result.date, position, *row)
+                        for position, row in enumerate(zip(m.room_types, m.rentals, m.percents, m.revenue, m.adr))
+                    ],
+                )
+        return len(results)
+
+    def periods(self, property_name=None):
+        """Stored periods in date order, optionally for one property."""
+        query = "SELECT DISTINCT period FROM reports"
+        params = ()
+        if property_name is not None:
+            query += " WHERE property = ?"
+            params = (property_name,)
+        with closing(self._connect()) as conn:
+            periods = [row[0] for row in conn.execute(query, params)]
+        return sorted(periods)
+
+    def known_reports(self):
+        """``(property, period, content hash)`` of every stored report."""
+        with closing(self._connect()) as conn:
+            return set(conn.execute("SELECT property, period, content_hash FROM reports"))
+
+    def load(self, start=None, end=None, property_name=None):
+        """Stored months as ``IngestResult``s, in period order.
+
+        ``start``/``end`` are inclusive period strings ("YYYY-MM" or "YYYY-MM-DD").
+        """
+        where, params = [], []
+        if start is not None:
+            where.append("r.period >= ?")
+            params.append(start)
+        if end is not None:
+            # "2024-03-15" sorts after "2024-03", so compare against the next character
+            where.append("r.period < ?")
+            params.append(end + "\uffff")
+        if property_name is not None:
+            where.append("r.property = ?")
+            params.append(property_name)
+        query = (
+            "SELECT r.property, r.period, r.filename, r.content_hash,"
+            " r.total_rentals, r.total_percent, r.total_revenue, r.total_adr,"
+            " m.room_type, m.rentals, m.percent, m.revenue, m.adr"
+            " FROM reports r JOIN metrics m ON m.property = r.property AND m.period = r.period"
+        )
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY r.period, r.property, m.position"
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        grouped = {}
+        for prop, period, filename, content_hash, t_rent, t_pct, t_rev, t_adr, *room in rows:
+            entry = grouped.setdefault((prop, period), ([], (filename, content_hash, t_rent, t_pct, t_rev, t_adr)))
+            entry[0].append(room)
+
+        results = []
+        for (prop, period), (rooms, (filename, content_hash, t_rent, t_pct, t_rev, t_adr)) in grouped.items():
+            room_types, rentals, percents, revenue, adr = (tuple(column) for column in zip(*rooms))
+            metrics = ReportMetrics(
+                room_types=room_types,
+                rentals=rentals,
+                percents=percents,
+                revenue=revenue,
+                adr=adr,
+                total_rentals=t_rent,
+                total_percent=t_pct,
+                total_revenue=t_rev,
+                total_adr=t_adr,
+                property_name=prop,
+            )
+            results.append(IngestResult(filename, period, metrics, content_hash))
+        return results
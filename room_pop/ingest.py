@@ -0,0 +1,286 @@
+"""Turn a batch of uploaded reports into extracted metrics.
+
+``ingest_reports`` works on a whole batch: reports already in the parse cache
+are answered straight away and the rest are parsed on a worker pool. xlrd is
+pure Python, so a thread pool mostly helps by overlapping I/O while a
+process pool spreads parsing over CPU cores.
+
+``iter_ingest`` is the memory-bounded alternative: one file at a time is
+read, parsed and reduced to its metrics before the next is touched, so only
+one report's bytes are ever held.
+
+Each report is dated by the period in its filename. When the filename has
+none, the report is still parsed and dated by the range printed in it.
+Its property is the one named in the report header, or failing that whatever
+is left of the filename; ``group_by_property`` splits a batch by property.
+"""
+
+import os
+import re
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from operator import itemgetter
+
+from .cache import content_key
+from .extract import ReportMetrics, read_report
+from .period import FILENAME, REPORT, Period
+
+DEFAULT_WORKERS = int(os.environ.get("ROOM_POP_WORKERS", min(8, os.cpu_count() or 1)))
+DEFAULT_EXECUTOR = os.environ.get("ROOM_POP_INGEST_EXECUTOR", "thread")
+
+NO_DATE = "no_date"
+READ_ERROR = "read_error"
+
+# Report name that exported filenames usually carry next to the period
+_REPORT_NAME = re.compile(r"room[\s_-]*type[\s_-]*popularity", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    filename: str
+    date: str  # Period label, "YYYY-MM" or "YYYY-MM-DD"
+    metrics: ReportMetrics
+    key: str = ""  # content hash of the source file
+    date_source: str = FILENAME  # or REPORT when dated by the range printed in the report
+
+    @property
+    def period(self):
+        return Period.parse(self.date, self.date_source)
+
+
+@dataclass(frozen=True)
+class IngestProblem:
+    filename: str
+    kind: str  # NO_DATE or READ_ERROR
+    message: str
+
+
+def property_from_filename(filename):
+    """What is left of a filename once its period, the report name and extension are removed."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    period = Period.parse(stem)
+    if period is not None:
+        stem = stem.replace(period.label, " ")
+    return " ".join(re.split(r"[\s_-]+", _REPORT_NAME.sub(" ", stem))).strip()
+
+
+def group_by_property(results):
+    """``{property name: [results]}``, properties in first-seen order and results in input order."""
+    groups = {}
+    for result in results:
+        groups.setdefault(result.metrics.property_name, []).append(result)
+    return groups
+
+
+def dedupe_periods(results):
+    """Keep one result per (property, period): the one whose filename sorts last.
+
+    Returns ``(kept, dropped)``: the kept results in input order, and a
+    ``(dropped result, result kept instead)`` pair per result left out.
+    """
+    results = list(results)
+    winners = {}
+    for result in sorted(results, key=lambda result: (result.filename, result.key)):
+        winners[(result.metrics.property_name, result.date)] = result
+    kept = [result for result in results if winners[(result.metrics.property_name, result.date)] is result]
+    dropped = [
+        (result, winners[(result.metrics.property_name, result.date)])
+        for result in results if winners[(result.metrics.property_name, result.date)] is not result
+    ]
+    return kept, dropped
+
+
+def describe_dropped(result, kept):
+    """One-line explanation of a ``dedupe_periods`` drop."""
+    return f"{result.filename} and {kept.filename} both cover {result.date}; using {kept.filename} and skipping {result.filename}"
+
+
+def dated_outcome(filename, period, metrics, key):
+    """``IngestResult`` dated by ``period``, falling back to the range printed in the report."""
+    if not metrics.property_name:
+        metrics = replace(metrics, property_name=property_from_filename(filename))
+    if period is None:
+        if not metrics.period:
+            return IngestProblem(filename, NO_DATE, "Could not find a date in the filename or the report")
+        period = Period.parse(metrics.period, REPORT)
+    return IngestResult(filename, period.label, metrics, key, period.source)
+
+
+# tracemalloc is process-wide, so overlapping track_peak_memory blocks share it
+_tracking_lock = threading.Lock()
+_tracking = {"holders": 0, "started": False}
+
+
+@contextmanager
+def track_peak_memory():
+    """Measure the peak Python heap allocation of the ``with`` block.
+
+    Yields a dict whose ``"peak_bytes"`` is filled in on exit. Safe to use
+    from several threads at once: tracing starts with the first block and
+    stops with the last, and the peak is only reset when no other block is
+    running. tracemalloc is process-wide, so the figure of overlapping blocks
+    includes each other's allocations and is an upper bound.
+    """
+    with _tracking_lock:
+        if _tracking["holders"] == 0:
+            _tracking["started"] = not tracemalloc.is_tracing()
+            if _tracking["started"]:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        _tracking["holders"] += 1
+        start, _ = tracemalloc.get_traced_memory()
+    stats = {}
+    try:
+        yield stats
+    finally:
+        with _tracking_lock:
+            stats["peak_bytes"] = tracemalloc.get_traced_memory()[1] - start
+            _tracking["holders"] -= 1
+            if _tracking["holders"] == 0 and _tracking["started"]:
+                tracemalloc.stop()
+
+
+def iter_ingest(files, cache=None, recorder=None):
+    """Yield an ``IngestResult`` or ``IngestProblem`` per ``(filename, data)`` pair, in input order.
+
+    ``data`` may be the file bytes or a zero-argument callable returning them,
+    so each file is only read when its turn comes and released right after.
+    Per-file parse and extract times go to the optional ``instrument.Recorder``.
+    """
+    for filename, data in files:
+        period = Period.parse(filename)
+        if callable(data):
+            data = data()
+        key = content_key(data)
+        future, owner = cache.claim(key) if cache is not None else (None, True)
+        try:
+            metrics, timings = parse_claimed(cache, key, data) if owner else (future.result(), None)
+        except Exception as e:
+            yield IngestProblem(filename, READ_ERROR, str(e))
+            continue
+        if timings is not None:
+            record_read(recorder, filename, timings)
+        elif recorder is not None:
+            recorder.count("cache hits")
+        del data
+        yield dated_outcome(filename, period, metrics, key)
+
+
+def read_timed(data):
+    """``(metrics, {"parse": s, "extract": s})``; a module-level function so process pools can run it."""
+    timings = {}
+    return read_report(data, timings=timings), timings
+
+
+def parse_claimed(cache, key, data):
+    """``read_timed(data)`` for the owner of a ``cache.claim(key)``, settling the claim either way."""
+    try:
+        metrics, timings = read_timed(data)
+    except BaseException as e:
+        if cache is not None:
+            cache.settle(key, error=e)
+        raise
+    if cache is not None:
+        cache.settle(key, metrics)
+    return metrics, timings
+
+
+def record_read(recorder, filename, timings):
+    """Add the ``read_timed`` timings of one file to the optional ``instrument.Recorder``."""
+    if recorder is not None:
+        recorder.add("parse", timings["parse"], filename)
+        recorder.add("extract", timings["extract"], filename)
+
+
+def make_executor(kind, workers):
+    """Worker pool of the ``kind`` ("thread" or "process") that ``ingest_reports`` and ``jobs`` parse on."""
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="room-pop-ingest")
+    raise ValueError(f"unknown executor {kind!r}; expected 'thread' or 'process'")
+
+
+def ingest_reports(files, cache=None, workers=DEFAULT_WORKERS, executor=DEFAULT_EXECUTOR, recorder=None):
+    """Extract metrics from ``(filename, bytes)`` pairs.
+
+    Returns ``(results, problems)``: results sorted by period, and one
+    ``IngestProblem`` per file that was skipped. A file
+    whose bytes appear several times in the batch is parsed once, and with a
+    ``cache`` so is a report another caller is parsing at the same time. Per-file
+    parse and extract times go to the optional ``instrument.Recorder``.
+    """
+    problems = []
+    pending = []  # (filename, period, key)
+    metrics_by_key = {}
+    errors_by_key = {}
+    to_parse = {}  # key -> bytes, for the reports this call claimed
+    joined = {}  # key -> future of a cache hit or of another caller's parse
+    names = {}  # key -> first filename with those bytes, for the recorder
+
+    try:
+        for filename, data in files:
+            key = content_key(data)
+            pending.append((filename, Period.parse(filename), key))
+            if key in joined or key in to_parse:
+                continue
+            future, owner = cache.claim(key) if cache is not None else (None, True)
+            if owner:
+                to_parse[key] = data
+                names[key] = filename
+            else:
+                joined[key] = future
+                if recorder is not None:
+                    recorder.count("cache hits")
+
+        if len(to_parse) == 1 or workers <= 1:
+            # Not worth spinning up a pool
+            for key, data in to_parse.items():
+                try:
+                    metrics_by_key[key], timings = read_timed(data)
+                except Exception as e:
+                    errors_by_key[key] = str(e)
+                else:
+                    record_read(recorder, names[key], timings)
+        elif to_parse:
+            with make_executor(executor, min(workers, len(to_parse))) as pool:
+                futures = {key: pool.submit(read_timed, data) for key, data in to_parse.items()}
+                for key, future in futures.items():
+                    try:
+                        metrics_by_key[key], timings = future.result()
+                    except Exception as e:
+                        errors_by_key[key] = str(e)
+                    else:
+                        record_read(recorder, names[key], timings)
+    finally:
+        # Release every claim, even on the way out of an error, so no caller waits forever
+        if cache is not None:
+            for key in to_parse:
+                if key in metrics_by_key:
+                    cache.settle(key, metrics_by_key[key])
+                else:
+                    cache.settle(key, error=ValueError(errors_by_key.get(key, "the parse was interrupted")))
+
+    # Only waited on once this call's own parses are settled, so two callers
+    # waiting on each other's reports cannot deadlock
+    for key, future in joined.items():
+        try:
+            metrics_by_key[key] = future.result()
+        except Exception as e:
+            errors_by_key[key] = str(e)
+
+    dated = []  # (period, result)
+    for filename, period, key in pending:
+        if key in errors_by_key:
+            problems.append(IngestProblem(filename, READ_ERROR, errors_by_key[key]))
+            continue
+        outcome = dated_outcome(filename, period, metrics_by_key[key], key)
+        if isinstance(outcome, IngestProblem):
+            problems.append(outcome)
+        else:
+            dated.append((Period.parse(outcome.date), outcome))
+    dated.sort(key=itemgetter(0))
+    return [result for _, result in dated], problems
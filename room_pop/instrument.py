@@ -0,0 +1,131 @@
+"""Lightweight timers and counters for attributing latency to pipeline stages.
+
+A ``Recorder`` collects one record per timed stage (optionally tagged with
+the file it worked on) and named counters for one run, e.g. one Streamlit
+rerun or one CLI invocation. Timing costs two ``perf_counter`` calls per
+stage, so it can stay on in production. cProfile capture is opt-in.
+"""
+
+import cProfile
+import csv
+import io
+import json
+import pstats
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Columns of the CSV export: stage timings fill "seconds", counters fill "count"
+CSV_FIELDS = ("run", "stage", "file", "seconds", "count")
+
+
+class Recorder:
+    def __init__(self, run=0, profile=False):
+        self.run = run
+        self.started = time.time()
+        self.records = []  # {"run", "stage", "file", "seconds"}
+        self.counters = Counter()
+        self._lock = threading.Lock()  # ingest workers record from other threads
+        self._profiler = cProfile.Profile() if profile else None
+        self._lap = time.perf_counter()
+
+    def add(self, stage, seconds, file=""):
+        with self._lock:
+            self.records.append({"run": self.run, "stage": stage, "file": file, "seconds": seconds})
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def merge(self, other):
+        """Copy the records and counters of ``other`` (e.g. a background job's) into this run."""
+        run = other.to_dict()
+        with self._lock:
+            self.records.extend(dict(record, run=self.run) for record in run["records"])
+            self.counters.update(run["counters"])
+
+    @contextmanager
+    def stage(self, name, file=""):
+        """Time the ``with`` block as one record of stage ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, file)
+
+    def lap_start(self):
+        """Start timing the next ``lap``."""
+        self._lap = time.perf_counter()
+
+    def lap(self, name, file=""):
+        """Record the time since the last ``lap_start``/``lap`` as stage ``name``.
+
+        Lets a long straight-line block be split into stages without indenting it.
+        """
+        now = time.perf_counter()
+        self.add(name, now - self._lap, file)
+        self._lap = now
+
+    @contextmanager
+    def profiling(self):
+        """Run the ``with`` block under cProfile if this recorder profiles (current thread only)."""
+        if self._profiler is None:
+            yield
+            return
+        self._profiler.enable()
+        try:
+            yield
+        finally:
+            self._profiler.disable()
+
+    @property
+    def profiled(self):
+        return self._profiler is not None
+
+    def profile_text(self, limit=30, sort="cumulative"):
+        """Top ``limit`` functions of the cProfile capture, as pstats prints them."""
+        if self._profiler is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def summary(self):
+        """``[{"stage", "calls", "seconds"}]`` per stage, slowest first."""
+        totals = {}
+        with self._lock:
+            for record in self.records:
+                calls, seconds = totals.get(record["stage"], (0, 0.0))
+                totals[record["stage"]] = (calls + 1, seconds + record["seconds"])
+        rows = [{"stage": stage, "calls": calls, "seconds": seconds} for stage, (calls, seconds) in totals.items()]
+        return sorted(rows, key=lambda row: row["seconds"], reverse=True)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "run": self.run,
+                "started": self.started,
+                "records": list(self.records),
+                "counters": dict(self.counters),
+            }
+
+
+def runs_json(recorders):
+    """JSON of the records and counters of several runs."""
+    return json.dumps([recorder.to_dict() for recorder in recorders], indent=2)
+
+
+def runs_csv(recorders):
+    """CSV with one line per stage record and per counter of several runs."""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for recorder in recorders:
+        run = recorder.to_dict()
+        writer.writerows(run["records"])
+        writer.writerows(
+            {"run": run["run"], "stage": name, "count": value}
+            for name, value in run["counters"].items()
+        )
+    return out.getvalue()
@@ -0,0 +1,177 @@
+"""Background ingestion jobs that outlive a Streamlit rerun.
+
+A rerun throws away whatever the script was doing, so reports parsed inside
+the script are parsed again every time a widget changes mid-upload. An
+``IngestJobManager`` owns a worker pool that lives outside the rerun cycle
+instead: ``submit`` hands it a batch and returns an ``IngestJob`` straight
+away, and later reruns look the job up by its id to show progress and pick
+up the results finished so far. Submitting the same batch again while it is
+still known returns the existing job, so nothing is parsed twice.
+
+Reports already in the parse cache are answered at submit time, and a report
+some other job or session is parsing right now waits for that parse; the rest
+are parsed on the pool with the same helpers as ``ingest.ingest_reports``.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import partial
+
+from .cache import content_key
+from .ingest import (
+    DEFAULT_EXECUTOR,
+    DEFAULT_WORKERS,
+    READ_ERROR,
+    IngestProblem,
+    dated_outcome,
+    make_executor,
+    read_timed,
+    record_read,
+)
+from .instrument import Recorder
+from .period import Period
+
+
+class IngestJob:
+    def __init__(self, job_id, filenames):
+        self.job_id = job_id
+        self.filenames = tuple(filenames)
+        self.started = time.time()
+        self.finished = None  # time.time() once every file has an outcome
+        self.recorder = Recorder()  # parse/extract times and cache hits of the job's files
+        self._outcomes = {}  # position in the batch -> IngestResult or IngestProblem
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        if not self.filenames:
+            self._finish()
+
+    def __len__(self):
+        return len(self.filenames)
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def progress(self):
+        """``(files with an outcome, files in the job)``."""
+        with self._lock:
+            return len(self._outcomes), len(self.filenames)
+
+    def outcomes(self):
+        """``{position: IngestResult or IngestProblem}`` of the files finished so far."""
+        with self._lock:
+            return dict(self._outcomes)
+
+    def wait(self, timeout=None):
+        """Block until every file has an outcome; ``False`` if ``timeout`` ran out first."""
+        return self._done.wait(timeout)
+
+    def _finish(self):
+        self.finished = time.time()
+        self._done.set()
+
+    def _settle(self, positions, outcome_for):
+        """Record ``outcome_for(filename)`` for every batch position holding the same report."""
+        outcomes = {position: outcome_for(self.filenames[position]) for position in positions}
+        with self._lock:
+            self._outcomes.update(outcomes)
+            finished = len(self._outcomes) == len(self.filenames)
+        if finished:
+            self._finish()
+
+    def _settle_metrics(self, positions, key, metrics):
+        self._settle(positions, lambda filename: dated_outcome(filename, Period.parse(filename), metrics, key))
+
+    def _parsed(self, positions, key, cache, future):
+        # Done-callback of one report's parse; runs on a pool thread
+        try:
+            metrics, timings = future.result()
+        except Exception as e:
+            if cache is not None:
+                cache.settle(key, error=e)
+            message = str(e)
+            self._settle(positions, lambda filename: IngestProblem(filename, READ_ERROR, message))
+            return
+        record_read(self.recorder, self.filenames[positions[0]], timings)
+        if cache is not None:
+            cache.settle(key, metrics)
+        self._settle_metrics(positions, key, metrics)
+
+    def _joined(self, positions, key, future):
+        # Done-callback of a parse claimed by someone else (or of a cache hit)
+        try:
+            metrics = future.result()
+        except Exception as e:
+            message = str(e)
+            self._settle(positions, lambda filename: IngestProblem(filename, READ_ERROR, message))
+            return
+        self._settle_metrics(positions, key, metrics)
+
+
+class IngestJobManager:
+    """Worker pool and registry of the ingestion jobs of one server process.
+
+    Thread-safe, so one instance can be shared by every session. At most
+    ``max_jobs`` finished jobs are remembered; running jobs are never dropped.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, executor=DEFAULT_EXECUTOR, max_jobs=32):
+        self.max_jobs = max_jobs
+        self._executor = make_executor(executor, workers)
+        self._jobs = OrderedDict()  # job id -> IngestJob, oldest first
+        self._ids = {}  # batch identity -> job id
+        self._lock = threading.Lock()
+
+    def get(self, job_id):
+        """The job with ``job_id``, or ``None`` once it has been forgotten."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def submit(self, files, cache=None):
+        """Start ingesting ``(filename, bytes)`` pairs in the background and return the ``IngestJob``.
+
+        Outcomes are keyed by each file's position in ``files``. A file whose
+        bytes appear several times in the batch is parsed once.
+        """
+        files = list(files)
+        keys = [content_key(data) for _, data in files]
+        identity = tuple((filename, key) for (filename, _), key in zip(files, keys))
+        with self._lock:
+            job = self._jobs.get(self._ids.get(identity))
+            if job is not None:
+                return job
+            job = IngestJob(uuid.uuid4().hex[:12], [filename for filename, _ in files])
+            self._jobs[job.job_id] = job
+            self._ids[identity] = job.job_id
+            self._forget_finished()
+
+        positions_by_key = {}
+        for position, key in enumerate(keys):
+            positions_by_key.setdefault(key, []).append(position)
+        for key, positions in positions_by_key.items():
+            claim, owner = cache.claim(key) if cache is not None else (None, True)
+            if owner:
+                try:
+                    future = self._executor.submit(read_timed, files[positions[0]][1])
+                except BaseException as e:
+                    if cache is not None:
+                        cache.settle(key, error=e)
+                    raise
+                future.add_done_callback(partial(job._parsed, positions, key, cache))
+            else:
+                job.recorder.count("cache hits")
+                claim.add_done_callback(partial(job._joined, positions, key))
+        return job
+
+    def _forget_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_jobs)]:
+            del self._jobs[job_id]
+        known = set(self._jobs)
+        self._ids = {identity: job_id for identity, job_id in self._ids.items() if job_id in known}
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,127 @@
+"""Where things live in a Room_Type_Popularity worksheet.
+
+A report is a run of room-type blocks: a label row ("KH", "King", ...) in the
+label column, one row per rate code, then a "Total" row in the subtotal
+column. A final "Totals" row in the label column closes the report. The
+number of blocks and of rate codes per block varies by property and month,
+so rows are found by scanning labels rather than by fixed offsets.
+
+All row and column numbers here are 0-based worksheet coordinates.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+
+
+@dataclass(frozen=True)
+class ReportLayout:
+    label_col: int = 4
+    subtotal_col: int = 7
+    subtotal_label: str = "Total"
+    grand_total_label: str = "Totals"
+    rentals_col: int = 9
+    percent_col: int = 25
+    revenue_col: int = 29
+    adr_col: int = 34
+    sheet_name: str = "Sheet1"
+    # "<property> <printed date> <time>  <user>" header line
+    property_cell: tuple = (1, 3)
+    # "MM/DD/YY - MM/DD/YY" range of days the report covers
+    period_cell: tuple = (9, 22)
+    # Report label -> room type shown in the app
+    aliases: tuple = (("King", "K"),)
+
+    @property
+    def metric_cols(self):
+        return (self.rentals_col, self.percent_col, self.revenue_col, self.adr_col)
+
+
+DEFAULT_LAYOUT = ReportLayout()
+
+
+@dataclass(frozen=True)
+class RowIndex:
+    """Room-type subtotal rows and the grand totals row of one worksheet."""
+
+    room_types: tuple
+    rows: tuple
+    totals_row: int
+
+
+# Trailing print timestamp and user name of the header line
+_PRINTED_SUFFIX = re.compile(r"\s+(\d{1,2})/(\d{1,2})/(\d{2,4})\s+\d{1,2}:\d{2}.*$")
+
+# "MM/DD/YY - MM/DD/YY" report range
+_RANGE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{2,4})\s*-\s*(\d{1,2})/(\d{1,2})/(\d{2,4})")
+
+
+def _date(month, day, year):
+    """``date`` from "MM", "DD", "YY"/"YYYY" strings; two-digit years are 20YY."""
+    year = int(year)
+    return date(year + 2000 if year < 100 else year, int(month), int(day))
+
+
+def property_name(header):
+    """Property name from the report header, e.g. "Best Western Firestone Inn & Suites"."""
+    return _PRINTED_SUFFIX.sub("", header.strip()) if isinstance(header, str) else ""
+
+
+def printed_date(header):
+    """"YYYY-MM-DD" the report was printed on, from its header, or ``""``."""
+    match = _PRINTED_SUFFIX.search(header.strip()) if isinstance(header, str) else None
+    if match is None:
+        return ""
+    try:
+        return _date(*match.groups()).isoformat()
+    except ValueError:
+        return ""
+
+
+def report_range(text):
+    """``(first day, last day)`` of the range a report covers, or ``None``."""
+    match = _RANGE.search(text) if isinstance(text, str) else None
+    if match is None:
+        return None
+    try:
+        start, end = _date(*match.groups()[:3]), _date(*match.groups()[3:])
+    except ValueError:
+        return None
+    return (start, end) if start <= end else None
+
+
+def _label(val):
+    return val.strip() if isinstance(val, str) else ""
+
+
+@lru_cache(maxsize=64)
+def _build_index(layout, labels, subtotals):
+    aliases = dict(layout.aliases)
+    room_types, rows = [], []
+    totals_row = None
+    current = None
+    for row, (label, subtotal) in enumerate(zip(labels, subtotals)):
+        if label == layout.grand_total_label:
+            totals_row = row
+            break
+        if label:
+            current = aliases.get(label, label)
+        elif current is not None and subtotal == layout.subtotal_label:
+            room_types.append(current)
+            rows.append(row)
+            current = None
+    if not rows:
+        raise ValueError("no room-type subtotal rows found; is this a Room Type Popularity report?")
+    if totals_row is None:
+        raise ValueError(f"no '{layout.grand_total_label}' row found in the report")
+    return RowIndex(tuple(room_types), tuple(rows), totals_row)
+
+
+def scan_rows(labels, subtotals, layout=DEFAULT_LAYOUT):
+    """Index the room-type rows from the label and subtotal column values.
+
+    The index is memoised on the layout and the two columns' contents, so
+    every report sharing a layout fingerprint is scanned only once.
+    """
+    return _build_index(layout, tuple(map(_label, labels)), tuple(map(_label, subtotals)))
@@ -0,0 +1,38 @@
+"""Currency parsing for report cells.
+
+Report cells come back from the readers as floats, as text such as
+"$1,234.56" or "58.62", or empty. Accounting-style negatives ("($12.50)")
+and stray whitespace also turn up. Blanks and anything unparseable become
+NaN instead of raising.
+"""
+
+import numpy as np
+import pandas as pd
+
+_BLANKS = ("", "None", "nan")
+
+
+def _parse_text(text):
+    """Parse a unicode array of money strings with NumPy's vectorised string ops."""
+    text = np.strings.strip(text)
+    negative = np.strings.startswith(text, "(") & np.strings.endswith(text, ")")
+    if negative.any():
+        text[negative] = np.strings.strip(text[negative], "()")
+    text = np.strings.replace(np.strings.replace(text, "$", ""), ",", "")
+    text = np.strings.strip(text)
+    text[np.isin(text, _BLANKS)] = "nan"
+    try:
+        out = text.astype(np.float64)
+    except ValueError:
+        # Some cell is not a number at all; fall back to per-cell coercion
+        out = pd.to_numeric(pd.Series(text.ravel()), errors="coerce").to_numpy(np.float64).reshape(text.shape)
+    out[negative] *= -1
+    return out
+
+
+def parse_money_array(values):
+    """Parse a whole column/array of money cells at once into a float64 array shaped like ``values``."""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "fiub":
+        return arr.astype(np.float64)
+    return _parse_text(arr.astype(str))
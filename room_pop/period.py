@@ -0,0 +1,102 @@
+"""Report periods parsed from filenames or from the range a report covers.
+
+A report covers a month ("YYYY-MM" in its filename) or a day ("YYYY-MM-DD").
+``Period`` is the typed, orderable form of that label, parsed by a single
+precompiled regex that also rejects impossible months and days, so a batch
+can be sorted and checked for clashing periods before any workbook is opened.
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+# "YYYY-MM" optionally followed by "-DD", not embedded in a longer number
+_PERIOD_RE = re.compile(r"(?<!\d)(\d{4})-(\d{2})(?:-(\d{2}))?(?!\d)")
+
+# Where a period came from
+FILENAME = "filename"
+REPORT = "report"  # the range printed in the report, used when the filename has none
+
+# Kinds of clash reported by find_conflicts
+DUPLICATE = "duplicate"  # the same month or day twice
+OVERLAP = "overlap"  # a whole-month report next to day reports of that month
+
+
+@dataclass(frozen=True, order=True)
+class Period:
+    year: int
+    month: int
+    day: int = 0  # 0 for a whole-month report
+    source: str = field(default=FILENAME, compare=False)
+
+    @classmethod
+    def parse(cls, text, source=FILENAME):
+        """First valid period in ``text`` (a filename or label), or ``None``."""
+        for match in _PERIOD_RE.finditer(text):
+            year, month, day = int(match[1]), int(match[2]), int(match[3] or 0)
+            try:
+                date(year, month, day or 1)
+            except ValueError:
+                # e.g. "2024-13" or "2024-02-30"; keep looking
+                continue
+            return cls(year, month, day, source)
+        return None
+
+    @classmethod
+    def from_range(cls, start, end, source=REPORT):
+        """Period of a report covering the dates ``start`` to ``end``.
+
+        Exactly one whole month gives that month; any other range gives its first day.
+        """
+        next_month = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        if start.day == 1 and end == next_month - timedelta(days=1):
+            return cls(start.year, start.month, 0, source)
+        return cls(start.year, start.month, start.day, source)
+
+    @property
+    def label(self):
+        """``YYYY-MM`` or ``YYYY-MM-DD``, the form stored with each result."""
+        return f"{self.year:04d}-{self.month:02d}" + (f"-{self.day:02d}" if self.day else "")
+
+    @property
+    def month_key(self):
+        return (self.year, self.month)
+
+    def __str__(self):
+        return self.label
+
+
+def find_conflicts(periods, properties=None):
+    """Clashing periods in ``{name: Period}``, checked before any file is parsed.
+
+    Returns ``[(kind, names)]`` with ``kind`` ``DUPLICATE`` for names sharing
+    a month or day, and ``OVERLAP`` for a whole-month report alongside day
+    reports of the same month. Names are in input order. With ``properties``
+    (``{name: property}``), only names of the same property can clash.
+    """
+    properties = properties or {}
+    by_month = defaultdict(list)
+    for name, period in periods.items():
+        if period is not None:
+            by_month[(properties.get(name, ""), period.month_key)].append((name, period))
+
+    conflicts = []
+    for entries in by_month.values():
+        if len(entries) < 2:
+            continue
+        by_label = defaultdict(list)
+        for name, period in entries:
+            by_label[period.label].append(name)
+        conflicts.extend((DUPLICATE, names) for names in by_label.values() if len(names) > 1)
+        days = [period.day for _, period in entries]
+        if 0 in days and any(days):
+            conflicts.append((OVERLAP, [name for name, _ in entries]))
+    return conflicts
+
+
+def describe_conflict(kind, names):
+    """One-line explanation of a ``find_conflicts`` entry."""
+    if kind == DUPLICATE:
+        return f"{len(names)} files cover the same period: {', '.join(names)}"
+    return f"a whole-month report overlaps day reports of that month: {', '.join(names)}"
@@ -0,0 +1,168 @@
+"""Readers that open a report in whatever file format it was saved in.
+
+Every reader is a context manager taking the raw bytes and the layout and
+yielding ``SheetCells``: the label and subtotal columns plus a
+``cell(row, col)`` accessor in worksheet coordinates. The extraction in
+``extract`` only ever sees those, so every format gives the same
+``ReportMetrics``.
+
+``open_report`` picks the reader from the file's leading bytes rather than
+its name, since exported files are often renamed:
+
+- legacy ``.xls`` (OLE2): xlrd, reading only the cells used;
+- ``.xlsx`` (zip): openpyxl in read-only mode, streaming rows until the
+  grand totals row;
+- Parquet: pyarrow, reading only the columns used;
+- anything else is taken as CSV text of the worksheet, read until the grand
+  totals row.
+
+The Parquet and CSV readers expect the worksheet saved as-is, one row per
+worksheet row and no header row of their own, as
+``pd.read_excel(..., header=None)`` followed by ``to_csv(index=False,
+header=False)`` gives. openpyxl and pyarrow are imported only when a file
+needs them. ``READERS`` maps a format name to its reader, and more can be
+added to it.
+"""
+
+import csv
+import io
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable
+
+import xlrd
+
+from .layout import DEFAULT_LAYOUT
+
+_XLS_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_ZIP_MAGIC = b"PK\x03\x04"
+_PARQUET_MAGIC = b"PAR1"
+
+
+@dataclass(frozen=True)
+class SheetCells:
+    """What the extraction reads from a worksheet, whatever the file format."""
+
+    cell: Callable  # cell(row, col) -> value
+    labels: list  # label column, top to bottom
+    subtotals: list  # subtotal column, same rows
+
+
+def _columns_used(layout):
+    return sorted({
+        layout.label_col, layout.subtotal_col, layout.property_cell[1], layout.period_cell[1], *layout.metric_cols
+    })
+
+
+def _is_grand_total(value, layout):
+    return isinstance(value, str) and value.strip() == layout.grand_total_label
+
+
+def _row_cells(rows, layout):
+    """``SheetCells`` over a list of row tuples (missing rows and cells read as empty)."""
+
+    def cell(row, col):
+        values = rows[row] if row < len(rows) else ()
+        return values[col] if col < len(values) else None
+
+    return SheetCells(
+        cell,
+        [cell(row, layout.label_col) for row in range(len(rows))],
+        [cell(row, layout.subtotal_col) for row in range(len(rows))],
+    )
+
+
+def _until_grand_total(rows, layout):
+    """Rows up to and including the grand totals row; the rest is never read."""
+    kept = []
+    for values in rows:
+        kept.append(values)
+        if layout.label_col < len(values) and _is_grand_total(values[layout.label_col], layout):
+            break
+    return kept
+
+
+def _open_sheet(book, layout):
+    try:
+        return book.sheet_by_name(layout.sheet_name)
+    except xlrd.XLRDError:
+        return book.sheet_by_index(0)
+
+
+@contextmanager
+def open_xls(data, layout=DEFAULT_LAYOUT):
+    book = xlrd.open_workbook(file_contents=data, on_demand=True)
+    try:
+        sheet = _open_sheet(book, layout)
+        yield SheetCells(sheet.cell_value, sheet.col_values(layout.label_col), sheet.col_values(layout.subtotal_col))
+    finally:
+        book.release_resources()
+
+
+@contextmanager
+def open_xlsx(data, layout=DEFAULT_LAYOUT):
+    try:
+        import openpyxl
+    except ImportError:
+        raise ValueError("reading .xlsx reports needs openpyxl (pip install openpyxl)") from None
+    book = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        sheet = book[layout.sheet_name] if layout.sheet_name in book.sheetnames else book.worksheets[0]
+        rows = sheet.iter_rows(max_col=_columns_used(layout)[-1] + 1, values_only=True)
+        yield _row_cells(_until_grand_total(rows, layout), layout)
+    finally:
+        book.close()
+
+
+@contextmanager
+def open_parquet(data, layout=DEFAULT_LAYOUT):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("reading Parquet reports needs pyarrow (pip install pyarrow)") from None
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    names = parquet.schema_arrow.names
+    used = [col for col in _columns_used(layout) if col < len(names)]
+    table = parquet.read(columns=[names[col] for col in used])
+    columns = {col: table.column(names[col]).to_pylist() for col in used}
+    empty = [None] * table.num_rows
+
+    def cell(row, col):
+        return columns.get(col, empty)[row] if row < table.num_rows else None
+
+    yield SheetCells(cell, columns.get(layout.label_col, empty), columns.get(layout.subtotal_col, empty))
+
+
+@contextmanager
+def open_csv(data, layout=DEFAULT_LAYOUT):
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = data.decode("cp1252", errors="replace")
+    rows = csv.reader(io.StringIO(text, newline=""))
+    yield _row_cells(_until_grand_total(rows, layout), layout)
+
+
+# Format name -> reader; open_report picks one per file from its leading bytes
+READERS = {
+    "xls": open_xls,
+    "xlsx": open_xlsx,
+    "parquet": open_parquet,
+    "csv": open_csv,
+}
+
+
+def sniff_format(data):
+    """Name of the ``READERS`` entry for the report bytes ``data``."""
+    if data.startswith(_XLS_MAGIC):
+        return "xls"
+    if data.startswith(_ZIP_MAGIC):
+        return "xlsx"
+    if data.startswith(_PARQUET_MAGIC):
+        return "parquet"
+    return "csv"
+
+
+def open_report(data, layout=DEFAULT_LAYOUT):
+    """Open the report bytes ``data`` with the reader for their format."""
+    return READERS[sniff_format(data)](data, layout)
@@ -0,0 +1,163 @@
+"""Month, quarter and year rollups of the trend metrics per room type.
+
+``RollupCube`` aggregates a ``MetricsStore`` once per grain. Rentals and
+revenue are summed, room percent is the mean of the months in the period and
+ADR is recomputed as revenue / rentals, never averaged. Each period also
+carries its change against the same period a year earlier (YoY) and against
+the previous period (MoM, QoQ), so comparing Q1 2024 with Q1 2025 is a lookup.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .store import METRIC_COLUMNS
+
+GRAINS = ("month", "quarter", "year")
+
+# Periods in a year at each grain, i.e. how far back "a year earlier" is
+PERIODS_PER_YEAR = {"month": 12, "quarter": 4, "year": 1}
+
+
+def period_ordinals(dates, grain="month"):
+    """Consecutive integer number of each datetime64's period (months since year 0 for months, ...)."""
+    if grain not in PERIODS_PER_YEAR:
+        raise ValueError(f"unknown grain {grain!r}; expected one of {', '.join(GRAINS)}")
+    months = np.asarray(dates, dtype="datetime64[M]").astype(np.int64) + 1970 * 12
+    return months // (12 // PERIODS_PER_YEAR[grain])
+
+
+def period_labels(ordinals, grain="month"):
+    """``YYYY-MM``, ``YYYY-Qn`` or ``YYYY`` label of each period ordinal."""
+    per_year = PERIODS_PER_YEAR[grain]
+    formats = {"month": "{}-{:02d}", "quarter": "{}-Q{}", "year": "{}"}
+    # Format each distinct period once
+    unique, codes = np.unique(np.asarray(ordinals, dtype=np.int64), return_inverse=True)
+    labels = [formats[grain].format(ordinal // per_year, ordinal % per_year + 1) for ordinal in unique.tolist()]
+    return np.asarray(labels, dtype=object)[codes]
+
+
+def rollup(store, grain="month", by_room_type=True):
+    """One row per property, period and room type with the metrics and ``Months``.
+
+    Columns are ``Property``, ``Period``, ``Ordinal``, ``Room Type`` (unless
+    ``by_room_type`` is false, which totals every room type of a property),
+    the metrics and ``Months``. Rows are in property, then period order, room
+    types in the store's order within a period.
+    """
+    rentals, percent, revenue, adr = METRIC_COLUMNS.values()
+    frame = pd.DataFrame({
+        "Property": pd.Categorical.from_codes(store.prop, categories=store.properties),
+        "Ordinal": period_ordinals(store.date, grain),
+        "Room Type": pd.Categorical.from_codes(store.room_type, categories=store.room_types),
+        rentals: store.rentals,
+        percent: store.percent,
+        revenue: store.revenue,
+    })
+    if by_room_type:
+        keys = ["Property", "Ordinal", "Room Type"]
+        aggregations = {percent: (percent, "mean"), "Months": (rentals, "size")}
+    else:
+        # Room percent is rentals / capacity, so each report's totals row gives
+        # the capacity of all its room types, including those with no sales.
+        # Every row of a report repeats it, so it is counted once per report.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            capacity = np.where(store.total_percent > 0, store.total_rentals / (store.total_percent / 100), 0.0)
+        first_row = np.unique(store.source, return_index=True)[1]
+        frame["Capacity"] = 0.0
+        frame.loc[first_row, "Capacity"] = capacity[first_row]
+        frame["Month"] = period_ordinals(store.date)
+        keys = ["Property", "Ordinal"]
+        aggregations = {"Capacity": ("Capacity", "sum"), "Months": ("Month", "nunique")}
+    frame = frame.groupby(keys, observed=True, as_index=False).agg(
+        **{rentals: (rentals, "sum"), revenue: (revenue, "sum")}, **aggregations
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if not by_room_type:
+            frame[percent] = np.where(frame["Capacity"] > 0, 100 * frame[rentals] / frame["Capacity"], 0.0)
+        frame[percent] = frame[percent].round(2)
+        frame[adr] = np.where(frame[rentals] > 0, frame[revenue] / frame[rentals], 0.0).round(2)
+    frame.insert(1, "Period", period_labels(frame["Ordinal"].to_numpy(), grain))
+    return frame[[*keys[:1], "Period", *keys[1:], rentals, percent, revenue, adr, "Months"]]
+
+
+def _with_deltas(frame, grain, keys):
+    """``frame`` plus ``<metric> YoY``/``YoY %`` and ``<metric> vs prev``/``vs prev %`` columns."""
+    keyed = frame.set_index(keys)
+    levels = [keyed.index.get_level_values(key) for key in keys]
+    ordinal = keys.index("Ordinal")
+    for label, lag in (("YoY", PERIODS_PER_YEAR[grain]), ("vs prev", 1)):
+        shifted = list(levels)
+        shifted[ordinal] = levels[ordinal] - lag
+        earlier = pd.MultiIndex.from_arrays(shifted)
+        for name in METRIC_COLUMNS.values():
+            before = keyed[name].reindex(earlier).to_numpy()
+            change = keyed[name].to_numpy() - before
+            frame[f"{name} {label}"] = change.round(2)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                frame[f"{name} {label} %"] = np.where(before != 0, 100 * change / before, np.nan).round(1)
+    return frame
+
+
+class RollupCube:
+    def __init__(self, tables, property_tables):
+        self.tables = tables  # grain -> rollup with deltas, indexed by (Property, Period, Room Type)
+        self.property_tables = property_tables  # grain -> all-room-types rollup, indexed by (Property, Period)
+
+    @classmethod
+    def from_store(cls, store):
+        tables, property_tables = {}, {}
+        for grain in GRAINS:
+            frame = _with_deltas(rollup(store, grain), grain, ["Property", "Ordinal", "Room Type"])
+            tables[grain] = frame.drop(columns="Ordinal").set_index(["Property", "Period", "Room Type"])
+            frame = _with_deltas(rollup(store, grain, by_room_type=False), grain, ["Property", "Ordinal"])
+            property_tables[grain] = frame.drop(columns="Ordinal").set_index(["Property", "Period"])
+        return cls(tables, property_tables)
+
+    def properties(self):
+        return list(self.tables["year"].index.get_level_values("Property").unique())
+
+    def _property(self, property_name):
+        if property_name is not None:
+            return property_name
+        properties = self.properties()
+        if len(properties) != 1:
+            raise ValueError(f"the cube holds {len(properties)} properties; pass property_name")
+        return properties[0]
+
+    def table(self, grain="month", property_names=None):
+        """The rollup at ``grain`` as a flat DataFrame, for display and export.
+
+        ``property_names`` limits it to those properties; the ``Property``
+        column is left out when only one property remains.
+        """
+        frame = self.tables[grain].reset_index()
+        if property_names is not None:
+            frame = frame[frame["Property"].isin(property_names)]
+        if frame["Property"].nunique() <= 1:
+            frame = frame.drop(columns="Property")
+        return frame
+
+    def property_table(self, grain="month", property_names=None):
+        """All-room-types totals per property and period at ``grain``, flat, with their deltas."""
+        frame = self.property_tables[grain].reset_index()
+        if property_names is not None:
+            frame = frame[frame["Property"].isin(property_names)]
+        return frame
+
+    def periods(self, grain="month"):
+        return sorted(self.tables[grain].index.get_level_values("Period").unique())
+
+    def lookup(self, grain, period, room_type, property_name=None):
+        """Row of metrics and deltas for one period and room type (``KeyError`` if absent).
+
+        ``property_name`` may be left out when the cube holds one property.
+        """
+        return self.tables[grain].loc[(self._property(property_name), period, room_type)]
+
+    def delta(self, grain, period, room_type, metric, against="YoY", percent=False, property_name=None):
+        """Change of ``metric`` against a year earlier (``"YoY"``) or the previous period (``"vs prev"``).
+
+        NaN when the earlier period is not in the data.
+        """
+        column = f"{metric} {against}" + (" %" if percent else "")
+        return self.tables[grain].at[(self._property(property_name), period, room_type), column]
@@ -0,0 +1,226 @@
+"""Columnar long-format table of the multi-file trend metrics.
+
+One row per (property, report date, room type), held as preallocated NumPy
+columns that are filled a whole report at a time. The four trend charts, the
+detail tables and the Excel export are all views over the same columns, and
+reports of several properties share one store.
+
+Every row remembers which report (source) it came from, so adding or
+removing a few reports patches the columns instead of rebuilding them.
+Stores are never modified in place; ``patch``/``sync`` return a new one.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Store column -> column name used in the charts, tables and export
+METRIC_COLUMNS = {
+    "rentals": "Total Rentals",
+    "percent": "Room Percents",
+    "revenue": "Total Revenue",
+    "adr": "ADR",
+}
+
+# Export sheet name for each metric
+TREND_SHEETS = {
+    "rentals": "Room Rentals Trends",
+    "percent": "Room Percent Trends",
+    "revenue": "Revenue Totals Trends",
+    "adr": "ADR Totals Trends",
+}
+
+_ROW_COLUMNS = ("prop", "date", "room_type", "source", *METRIC_COLUMNS, "total_rentals", "total_percent")
+
+
+def source_id(result):
+    """Identity of the report behind an ``IngestResult``."""
+    return (result.metrics.property_name, result.date, result.key)
+
+
+class MetricsStore:
+    def __init__(
+        self, prop, properties, date, room_type, room_types, source, sources, rentals, percent, revenue, adr,
+        total_rentals, total_percent,
+    ):
+        self.prop = prop  # int codes into properties
+        self.properties = properties
+        self.date = date  # datetime64[ns]
+        self.room_type = room_type  # int codes into room_types
+        self.room_types = room_types
+        self.source = source  # int codes into sources
+        self.sources = sources  # source id -> code, including dropped sources
+        self.rentals = rentals
+        self.percent = percent
+        self.revenue = revenue
+        self.adr = adr
+        # The report's own totals row, repeated on each of its rows
+        self.total_rentals = total_rentals
+        self.total_percent = total_percent
+        self._frame = None
+        self._cube = None
+
+    @classmethod
+    def from_results(cls, results, room_types=(), sources=None, properties=()):
+        """Build the store from ``IngestResult``s, one block of rows per report.
+
+        ``room_types``, ``sources`` and ``properties`` seed the code tables, so
+        codes of an existing store stay valid when its rows are combined with these.
+        """
+        results = list(results)
+        n = sum(len(result.metrics.room_types) for result in results)
+        prop = np.empty(n, dtype=np.int32)
+        date = np.empty(n, dtype="datetime64[ns]")
+        room_type = np.empty(n, dtype=np.int32)
+        source = np.empty(n, dtype=np.int32)
+        rentals, percent, revenue, adr, total_rentals, total_percent = (np.empty(n, dtype=np.float64) for _ in range(6))
+        codes = {rt: code for code, rt in enumerate(room_types)}
+        property_codes = {name: code for code, name in enumerate(properties)}
+        sources = dict(sources or {})
+
+        start = 0
+        for result in results:
+            metrics = result.metrics
+            stop = start + len(metrics.room_types)
+            prop[start:stop] = property_codes.setdefault(metrics.property_name, len(property_codes))
+            date[start:stop] = np.datetime64(result.date, "ns")
+            room_type[start:stop] = [codes.setdefault(rt, len(codes)) for rt in metrics.room_types]
+            source[start:stop] = sources.setdefault(source_id(result), len(sources))
+            rentals[start:stop] = metrics.rentals
+            percent[start:stop] = metrics.percents
+            revenue[start:stop] = metrics.revenue
+            adr[start:stop] = metrics.adr
+            total_rentals[start:stop] = metrics.total_rentals
+            total_percent[start:stop] = metrics.total_percent
+            start = stop
+
+        return cls(
+            prop, tuple(property_codes), date, room_type, tuple(codes), source, sources, rentals, percent, revenue, adr,
+            total_rentals, total_percent,
+        )._sorted()
+
+    @classmethod
+    def empty(cls):
+        return cls.from_results([])
+
+    def _with_rows(self, rows):
+        """New store with only ``rows`` (an index array or mask), sharing the code tables."""
+        return MetricsStore(
+            properties=self.properties,
+            room_types=self.room_types,
+            sources=self.sources,
+            **{name: getattr(self, name)[rows] for name in _ROW_COLUMNS},
+        )
+
+    def _sorted(self):
+        # Rows in property, then date order; stable so each report's room types keep their order
+        order = np.lexsort((self.date, self.prop))
+        if np.all(order[1:] > order[:-1]):
+            return self
+        return self._with_rows(order)
+
+    def property_names(self):
+        """Names of the properties with rows in the store, in code order."""
+        return tuple(self.properties[code] for code in np.unique(self.prop))
+
+    @property
+    def multi_property(self):
+        return len(np.unique(self.prop)) > 1
+
+    def source_ids(self):
+        """Ids of the reports currently in the store."""
+        present = np.unique(self.source)
+        return {sid for sid, code in self.sources.items() if code in present}
+
+    def patch(self, added=(), removed=()):
+        """New store with the ``added`` results' rows appended and ``removed`` source ids dropped."""
+        removed_codes = [self.sources[sid] for sid in removed if sid in self.sources]
+        keep = ~np.isin(self.source, removed_codes) if removed_codes else slice(None)
+        new = MetricsStore.from_results(added, self.room_types, self.sources, self.properties)
+        columns = {
+            name: np.concatenate([getattr(self, name)[keep], getattr(new, name)])
+            for name in _ROW_COLUMNS
+        }
+        return MetricsStore(
+            properties=new.properties,
+            room_types=new.room_types,
+            sources=new.sources,
+            **columns,
+        )._sorted()
+
+    def sync(self, results):
+        """New store holding exactly ``results``, touching only the reports that changed.
+
+        Returns ``(store, added, removed)`` with the number of reports added and removed.
+        """
+        wanted = {source_id(result): result for result in results}
+        current = self.source_ids()
+        added = [result for sid, result in wanted.items() if sid not in current]
+        removed = current - wanted.keys()
+        if not added and not removed:
+            return self, 0, 0
+        return self.patch(added, removed), len(added), len(removed)
+
+    def __len__(self):
+        return len(self.date)
+
+    def to_frame(self):
+        """The whole store as a DataFrame with ``Property``, ``Date``, ``Date_str``, ``Room Type`` and metric columns.
+
+        Built once per store and reused; treat it as read-only.
+        """
+        if self._frame is not None:
+            return self._frame
+        # Format each distinct date once rather than once per row
+        unique_dates, date_codes = np.unique(self.date, return_inverse=True)
+        date_labels = np.asarray(pd.DatetimeIndex(unique_dates).strftime("%Y-%m"), dtype=object)
+        frame = pd.DataFrame({
+            "Property": pd.Categorical.from_codes(self.prop, categories=self.properties),
+            "Date": self.date,
+            "Date_str": date_labels[date_codes],
+            "Room Type": pd.Categorical.from_codes(self.room_type, categories=self.room_types),
+        })
+        for column, name in METRIC_COLUMNS.items():
+            frame[name] = getattr(self, column)
+        self._frame = frame
+        return frame
+
+    def _id_columns(self):
+        """Leading columns of the tables and exports: ``Property`` (only with several), ``Date``, ``Room Type``."""
+        return (["Property"] if self.multi_property else []) + ["Date", "Room Type"]
+
+    def columns(self):
+        """``{column name: values}`` for ``Property`` (only with several), ``Date`` (YYYY-MM), ``Room Type`` and every metric.
+
+        Plain arrays without building a DataFrame, for the streaming exports.
+        """
+        unique_dates, date_codes = np.unique(self.date, return_inverse=True)
+        date_labels = np.asarray(pd.DatetimeIndex(unique_dates).strftime("%Y-%m"), dtype=object)
+        columns = {}
+        if self.multi_property:
+            columns["Property"] = np.asarray(self.properties, dtype=object)[self.prop]
+        columns["Date"] = date_labels[date_codes]
+        columns["Room Type"] = np.asarray(self.room_types, dtype=object)[self.room_type]
+        for column, name in METRIC_COLUMNS.items():
+            columns[name] = getattr(self, column)
+        return columns
+
+    def rollup_cube(self):
+        """Month/quarter/year ``RollupCube`` of the store, built once and reused."""
+        if self._cube is None:
+            from .rollup import RollupCube
+
+            self._cube = RollupCube.from_store(self)
+        return self._cube
+
+    def metric_frame(self, column, frame=None):
+        """``Date`` / ``Room Type`` / metric view of one metric, as shown in the tables."""
+        if frame is None:
+            frame = self.to_frame()
+        name = METRIC_COLUMNS[column]
+        columns = ["Date_str" if id_column == "Date" else id_column for id_column in self._id_columns()]
+        return frame[columns + [name]].rename(columns={"Date_str": "Date"})
+
+    def trend_sheets(self):
+        """``{sheet name: DataFrame}`` for the multi-file trends workbook."""
+        frame = self.to_frame()
+        return {sheet: self.metric_frame(column, frame) for column, sheet in TREND_SHEETS.items()}
@@ -0,0 +1,6 @@
+"""Streamlit views of the app; each module's ``render()`` draws one view.
+
+pandas, Altair and the parsing modules are imported inside the code paths
+that use them, so a view can draw its widgets (and the app its first paint)
+without loading them.
+"""
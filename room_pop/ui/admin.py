@@ -0,0 +1,38 @@
+"""Admin panel with the shared parse cache's counters.
+
+Shown at the bottom of the page when the app is opened with ``?admin=1``.
+"""
+
+import streamlit as st
+
+from .resources import get_parse_cache
+
+
+def is_enabled():
+    return st.query_params.get("admin") == "1"
+
+
+def render():
+    cache = get_parse_cache()
+    stats = cache.stats()
+    with st.expander("🛠️ Shared parse cache (admin)"):
+        st.caption("One cache per server process, shared by every browser session.")
+        col_hits, col_disk, col_misses, col_rate = st.columns(4)
+        col_hits.metric("Memory hits", stats["hits"])
+        col_disk.metric("Disk hits", stats["disk_hits"])
+        col_misses.metric("Misses (parsed)", stats["misses"])
+        col_rate.metric("Hit rate", f"{stats['hit_rate']:.0%}")
+
+        col_entries, col_size, col_evicted, col_expired = st.columns(4)
+        col_entries.metric("Reports cached", stats["entries"])
+        col_size.metric("Memory used", f"{stats['bytes'] / 2**20:.2f} MB")
+        col_evicted.metric("Evictions", stats["evictions"])
+        col_expired.metric("Expirations", stats["expirations"])
+
+        ttl = f"{cache.ttl:g} s" if cache.ttl is not None else "none"
+        cap = f"{cache.max_bytes / 2**20:g} MB" if cache.max_bytes is not None else "none"
+        st.write(f"Limits: {cache.max_entries} reports, {cap} memory, TTL {ttl}, disk tier: {cache.disk_dir or 'off'}")
+
+        if st.button("🧹 Clear in-memory cache"):
+            cache.clear()
+            st.rerun()
@@ -0,0 +1,77 @@
+"""Diagnostics panel with the stage timings of this session's reruns.
+
+Every rerun gets an ``instrument.Recorder``; the views time their stages
+(parsing and extracting each file, building the tables, charts and export)
+into ``current()``. The panel is shown at the bottom of the page when the app
+is opened with ``?diagnostics=1`` and can also profile reruns with cProfile.
+"""
+
+import streamlit as st
+
+from ..instrument import Recorder, runs_csv, runs_json
+
+# Reruns kept per session for the panel and its downloads
+MAX_RUNS = 20
+
+
+def is_enabled():
+    return st.query_params.get("diagnostics") == "1"
+
+
+def begin_run():
+    """Start and return the recorder of this rerun."""
+    run = st.session_state.get("diagnostics_run", 0) + 1
+    st.session_state.diagnostics_run = run
+    recorder = Recorder(run, profile=is_enabled() and st.session_state.get("diagnostics_profile", False))
+    st.session_state.diagnostics_recorder = recorder
+    return recorder
+
+
+def current():
+    """Recorder of the current rerun."""
+    recorder = st.session_state.get("diagnostics_recorder")
+    if recorder is None:
+        recorder = begin_run()
+    return recorder
+
+
+def end_run(recorder):
+    runs = st.session_state.get("diagnostics_runs", [])
+    st.session_state.diagnostics_runs = (runs + [recorder])[-MAX_RUNS:]
+
+
+def render():
+    runs = st.session_state.get("diagnostics_runs", [])
+    with st.expander("🩺 Diagnostics"):
+        st.checkbox("Profile the next reruns with cProfile", key="diagnostics_profile",
+                    help="Main script thread only; parsing on worker threads shows up as waiting.")
+        if not runs:
+            st.write("No reruns recorded yet.")
+            return
+
+        latest = runs[-1]
+        st.write(f"#### Rerun {latest.run}")
+        st.dataframe(latest.summary(), use_container_width=True, hide_index=True)
+        if latest.counters:
+            st.write("Counters: " + ", ".join(f"{name} {value:,}" for name, value in latest.counters.items()))
+
+        per_file = [record for recorder in runs for record in recorder.records if record["file"]]
+        if per_file:
+            st.write("#### Per file")
+            st.dataframe(per_file[-200:], use_container_width=True, hide_index=True)
+
+        st.write("#### Recent reruns")
+        st.dataframe(
+            [{"run": recorder.run, "stages": len(recorder.records),
+              "seconds": sum(row["seconds"] for row in recorder.summary() if row["stage"] == "script run")}
+             for recorder in reversed(runs)],
+            use_container_width=True, hide_index=True,
+        )
+
+        if latest.profiled:
+            st.write("#### cProfile (latest rerun)")
+            st.code(latest.profile_text())
+
+        col_json, col_csv = st.columns(2)
+        col_json.download_button("⬇️ Timings as JSON", runs_json(runs), file_name="room_pop_diagnostics.json", mime="application/json")
+        col_csv.download_button("⬇️ Timings as CSV", runs_csv(runs), file_name="room_pop_diagnostics.csv", mime="text/csv")
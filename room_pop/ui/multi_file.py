@@ -0,0 +1,451 @@
+"""Multi Room Pop Excel File Analysis by Date view."""
+
+import streamlit as st
+
+from .diagnostics import current, is_enabled
+from .resources import (
+    UPLOAD_TYPES,
+    get_history_store,
+    get_ingest_jobs,
+    get_parse_cache,
+    save_to_history,
+    trend_analytics,
+    trends_export_bytes,
+)
+
+# One entry per trend chart, in display order (same order as the export sheets)
+TREND_CHARTS = [
+    {"metric": "Total Rentals", "label": "Total Rentals", "format": ",.0f",
+     "heading": "#### Total Rentals by Room Type Across Dates", "title": "Total Rentals by Room Type Over Time",
+     "table_heading": "#### Total Rentals Trend Data"},
+    {"metric": "Room Percents", "label": "Room Percents", "format": ".1f",
+     "heading": "#### Room Percents by Room Type Across Dates", "title": "Room Percentages by Room Type Over Time",
+     "table_heading": "#### Room Percent Trend Data"},
+    {"metric": "Total Revenue", "label": "Total Revenue", "format": "$,.2f",
+     "heading": "#### Total Revenue by Room Type Across Dates", "title": "Total Revenue by Room Type Over Time",
+     "table_heading": "#### Total Revenue Trend Data"},
+    {"metric": "ADR", "label": "ADR", "format": "$,.2f",
+     "heading": "#### Average Daily Rate (ADR) by Room Type Across Dates", "title": "ADR by Room Type Over Time",
+     "table_heading": "#### Average Daily Rate (ADR) Trend Data"},
+]
+
+# Chart period choices -> rollup grain (None picks one from the number of months)
+CHART_PERIODS = {"Auto": None, "Month": "month", "Quarter": "quarter", "Year": "year"}
+
+# Download format choices -> export format
+DOWNLOAD_FORMATS = {
+    "Excel workbook (.xlsx)": "xlsx",
+    "CSV, one long table (.csv)": "csv",
+    "CSV per trend sheet (.zip)": "zip",
+    "Parquet (.parquet)": "parquet",
+}
+
+# Months ahead forecast for occupancy and ADR
+FORECAST_MONTHS = 3
+
+# Seconds between progress checks while files are processed in the background
+PROGRESS_INTERVAL = 1.0
+
+
+@st.fragment(run_every=PROGRESS_INTERVAL)
+def _ingest_progress(job_ids, seen):
+    """Progress bar of this session's background jobs.
+
+    Only this fragment reruns on the timer; once more files are done than the
+    ``seen`` the page was drawn with, the whole page reruns to pick them up.
+    """
+    jobs = [job for job in map(get_ingest_jobs().get, job_ids) if job is not None]
+    done = sum(job.progress[0] for job in jobs)
+    total = sum(len(job) for job in jobs)
+    st.progress(done / total if total else 1.0, text=f"Processing files in the background: {done} of {total} done")
+    if done > seen or all(job.done for job in jobs):
+        st.rerun()
+
+
+def render():
+
+    col1, col2, col3 = st.columns([1, 3, 1])
+
+    with col2:
+        st.header("Multi Excel File Room Pop Analysis by Date")
+        st.markdown("---")  # Just a divider line for UX
+        # --------- FILE UPLOADER ---------
+        st.subheader("📥 Download multiple files for analysis:")
+        st.write('Minimum of 2 files must be loaded. Each file is dated by the "YYYY-MM" or "YYYY-MM-DD" in its name or, failing that, by the date range printed in the report')
+
+        # Add a unique key for the file uploader
+        file_uploader_key = "file_uploader_default"
+
+        use_demo = st.button("📂 Use Demo Files")
+
+        if use_demo:
+            # Reset uploaded files state
+            st.session_state.uploaded_data = {}  # Clear any previously uploaded files
+            st.session_state.use_demo = True  # Mark demo mode as active
+            file_uploader_key = "file_uploader_reset"  # Change the key to reset the file uploader
+            successful_uploads = []  # List to store successfully uploaded filenames
+
+            # Load demo files
+            demo_files = {
+                "2024-01 Room_Type_Popularity.xls": "2024-01 Room_Type_Popularity.xls",
+                "2024-02 Room_Type_Popularity.xls": "2024-02 Room_Type_Popularity.xls",
+                "2024-03 Room_Type_Popularity.xls": "2024-03 Room_Type_Popularity.xls",
+                "2025-01 Room_Type_Popularity.xls": "2025-01 Room_Type_Popularity.xls",
+                "2025-02 Room_Type_Popularity.xls": "2025-02 Room_Type_Popularity.xls",
+                "2025-03 Room_Type_Popularity.xls": "2025-03 Room_Type_Popularity.xls",
+            }
+            from ..ingest import NO_DATE, ingest_reports
+
+            demo_reports = []
+            for filename, path in demo_files.items():
+                with open(path, "rb") as fh:
+                    demo_reports.append((filename, fh.read()))
+
+            results, problems = ingest_reports(demo_reports, cache=get_parse_cache(), recorder=current())
+            for problem in problems:
+                if problem.kind == NO_DATE:
+                    st.warning(f"⚠️ Could not find a date in the filename or report of {problem.filename} (demo file).")
+                else:
+                    st.error(f"🚨 Error reading demo file '{problem.filename}': {problem.message}")
+            for result in results:
+                st.session_state.uploaded_data[result.filename] = result
+                successful_uploads.append(result.filename)  # Add to the list of successful uploads
+
+            # Display a single success message with the total count of uploaded files
+            if successful_uploads:
+                success_message = f"✅ **{len(successful_uploads)} Demo files successfully uploaded:**\n\n" + "\n".join(f"- {file}" for file in successful_uploads)
+                st.markdown(success_message)
+
+        # File uploader with dynamic key
+        uploaded_files = st.file_uploader(
+            "📄 Select Multiple Visual Matrix output Excel files to analyze",
+            type=UPLOAD_TYPES,
+            help="Legacy .xls, .xlsx, or the worksheet saved as CSV or Parquet.",
+            accept_multiple_files=True,
+            key=file_uploader_key,  # Use the dynamic key
+        )
+
+        streaming_mode = st.checkbox(
+            "🪶 Low-memory mode: process files one at a time",
+            key="streaming_mode",
+            help="Slower for big batches, but only one file is held in memory at a time.",
+        )
+
+        if uploaded_files:
+            if st.session_state.use_demo:
+                # Reset demo file state
+                st.session_state.use_demo = False  # Mark demo mode as inactive
+                st.session_state.uploaded_data = {}  # Clear any previously loaded demo files
+
+            # Results are kept per uploaded file id, so a rerun only processes
+            # the files added since the last one and drops the ones removed.
+            # Files still being processed by a background job are not submitted again.
+            current_files = {uploaded_file.file_id: uploaded_file for uploaded_file in uploaded_files}
+            upload_problems = st.session_state.setdefault("upload_problems", {})
+            ingest_jobs = st.session_state.setdefault("ingest_jobs", {})  # job id -> file id of each file in the job
+            in_flight = {file_id for file_ids in ingest_jobs.values() for file_id in file_ids}
+            for file_id in (st.session_state.uploaded_data.keys() | upload_problems.keys()) - current_files.keys():
+                st.session_state.uploaded_data.pop(file_id, None)
+                upload_problems.pop(file_id, None)
+            new_files = [
+                (file_id, uploaded_file) for file_id, uploaded_file in current_files.items()
+                if file_id not in st.session_state.uploaded_data and file_id not in upload_problems and file_id not in in_flight
+            ]
+
+            from ..ingest import NO_DATE, property_from_filename
+            from ..period import REPORT, Period, describe_conflict, find_conflicts
+
+            # Clashing periods are spotted from the filenames alone, before any parsing
+            names = [uploaded_file.name for uploaded_file in current_files.values()]
+            properties = {name: property_from_filename(name) for name in names}
+            for kind, clashing in find_conflicts({name: Period.parse(name) for name in names}, properties):
+                st.warning(f"⚠️ {describe_conflict(kind, clashing)}.")
+
+            if new_files and streaming_mode:
+                from ..ingest import IngestProblem, iter_ingest, track_peak_memory
+
+                # One file at a time: read, extract, keep only the metrics, move on
+                progress = st.progress(0.0, text="Processing files...")
+                with track_peak_memory() as memory:
+                    files = ((uploaded_file.name, uploaded_file.getvalue) for _, uploaded_file in new_files)
+                    for done, ((file_id, _), outcome) in enumerate(zip(new_files, iter_ingest(files, cache=get_parse_cache(), recorder=current())), start=1):
+                        if isinstance(outcome, IngestProblem):
+                            upload_problems[file_id] = outcome
+                        else:
+                            st.session_state.uploaded_data[file_id] = outcome
+                        progress.progress(done / len(new_files), text=f"Processed {outcome.filename}")
+                progress.empty()
+                st.caption(f"🪶 Peak memory while processing {len(new_files)} file(s): {memory['peak_bytes'] / 2**20:.1f} MB")
+
+            elif new_files:
+                # Parse the new files on the shared background pool; this and the
+                # following reruns pick up whatever has finished so far.
+                job = get_ingest_jobs().submit(
+                    ((uploaded_file.name, uploaded_file.getvalue()) for _, uploaded_file in new_files),
+                    cache=get_parse_cache(),
+                )
+                ingest_jobs[job.job_id] = [file_id for file_id, _ in new_files]
+
+            if ingest_jobs:
+                from ..ingest import IngestProblem
+
+                seen = 0  # outcomes of the still-running jobs already on this page
+                forgotten = False
+                for job_id, file_ids in list(ingest_jobs.items()):
+                    job = get_ingest_jobs().get(job_id)
+                    if job is None:
+                        # Forgotten by the server (e.g. restarted); its files are resubmitted on the rerun below
+                        del ingest_jobs[job_id]
+                        forgotten = True
+                        continue
+                    outcomes = job.outcomes()
+                    for position, outcome in outcomes.items():
+                        file_id = file_ids[position]
+                        if file_id not in current_files or file_id in st.session_state.uploaded_data or file_id in upload_problems:
+                            continue
+                        if isinstance(outcome, IngestProblem):
+                            upload_problems[file_id] = outcome
+                        else:
+                            st.session_state.uploaded_data[file_id] = outcome
+                    if len(outcomes) == len(job):
+                        current().merge(job.recorder)
+                        del ingest_jobs[job_id]
+                    else:
+                        seen += len(outcomes)
+                if forgotten:
+                    # Nothing else would rerun the page to resubmit those files
+                    st.rerun()
+                if ingest_jobs:
+                    _ingest_progress(list(ingest_jobs), seen)
+
+            for problem in upload_problems.values():
+                if problem.kind == NO_DATE:
+                    st.warning(f"⚠️ Could not find a date in {problem.filename}: its name has no \"YYYY-MM\" or \"YYYY-MM-DD\" and the report has no date range. This file will not be used for the time-based graph.")
+                else:
+                    st.error(f"🚨 Error reading Excel file '{problem.filename}': {problem.message}")
+
+            # Display a single success message with the total count of uploaded files
+            successful_uploads = sorted(st.session_state.uploaded_data.values(), key=lambda result: result.period)
+            for result in successful_uploads:
+                if result.date_source == REPORT:
+                    printed = f", printed {result.metrics.printed_on}" if result.metrics.printed_on else ""
+                    st.warning(f"⚠️ No date in the filename {result.filename}; it is dated by the period in the report ({result.date}{printed}). Rename it to include \"YYYY-MM\" if that is wrong.")
+            if successful_uploads:
+                from ..ingest import group_by_property
+
+                by_property = group_by_property(successful_uploads)
+                if len(by_property) > 1:
+                    success_message = f"✅ **{len(successful_uploads)} files successfully uploaded for {len(by_property)} properties:**\n\n" + "\n".join(
+                        f"- **{property_name or 'Unnamed property'}**: " + ", ".join(result.filename for result in results)
+                        for property_name, results in by_property.items()
+                    )
+                else:
+                    success_message = f"✅ **{len(successful_uploads)} files successfully uploaded:**\n\n" + "\n".join(f"- {result.filename}" for result in successful_uploads)
+                st.markdown(success_message)
+
+        elif not st.session_state.use_demo:
+            # Every uploaded file was removed
+            st.session_state.uploaded_data = {}
+            st.session_state.upload_problems = {}
+            st.session_state.ingest_jobs = {}
+
+        # One file per property and period, by the same rule as the command line,
+        # so the file kept never depends on the order the files finished in
+        uploaded_results = list(st.session_state.uploaded_data.values())
+        if uploaded_results:
+            from ..ingest import dedupe_periods, describe_dropped
+
+            uploaded_results, dropped = dedupe_periods(uploaded_results)
+            for result, kept in dropped:
+                st.warning(f"⚠️ {describe_dropped(result, kept)}.")
+            # Only the user's own reports are kept; the demo files would
+            # otherwise overwrite real months of the same period
+            if not st.session_state.use_demo:
+                save_to_history(uploaded_results)
+
+        # --------- SAVED HISTORY ---------
+        history_results = []
+        history = get_history_store()
+        if history is not None:
+            stored_periods = history.periods()
+            if stored_periods:
+                with st.expander(f"📚 Saved history ({len(stored_periods)} months)"):
+                    if st.checkbox("Include saved months in the graphs", value=True, key="use_history"):
+                        if len(stored_periods) > 1:
+                            history_start, history_end = st.select_slider(
+                                "Months to include", options=stored_periods,
+                                value=(stored_periods[0], stored_periods[-1]),
+                            )
+                        else:
+                            history_start = history_end = stored_periods[0]
+                        with current().stage("history load"):
+                            history_results = history.load(history_start, history_end)
+
+        # Uploaded files win over saved months of the same property and period
+        trend_results = {(result.metrics.property_name, result.date): result for result in history_results}
+        trend_results.update(((result.metrics.property_name, result.date), result) for result in uploaded_results)
+
+        # --------- UI OPTIONS ---------
+        with col2:
+            if trend_results:
+                download_format = DOWNLOAD_FORMATS[st.selectbox(
+                    "Trends download format", list(DOWNLOAD_FORMATS), key="download_format",
+                    help="CSV, ZIP and Parquet downloads are quicker to build than Excel for many months.",
+                )]
+                # Several properties: chart one of them by room type, or compare them on their totals
+                trend_properties = sorted({property_name for property_name, _ in trend_results})
+                selected_properties = trend_properties
+                if len(trend_properties) > 1:
+                    selected_properties = st.multiselect(
+                        "Properties", trend_properties, default=trend_properties, key="selected_properties",
+                        help="Pick one property to chart it by room type, or several to compare their totals.",
+                    )
+                chart_grain = CHART_PERIODS[st.selectbox(
+                    "Chart periods", list(CHART_PERIODS), key="chart_periods",
+                    help="Auto plots months, switching to quarters or years when there are many months. "
+                         "Quarters and years sum rentals and revenue and recompute ADR from them.",
+                )]
+                # Graphs asked for while files are still processing are redrawn on every
+                # rerun, so they fill in as months arrive, until the last file is in.
+                ingesting = bool(st.session_state.get("ingest_jobs"))
+                show_graphs = st.button("⚙️ Generate Graphs")
+                if show_graphs or st.session_state.get("live_graphs"):
+                    st.session_state.live_graphs = ingesting
+                    show_graphs = True
+                if show_graphs:
+                    if ingesting:
+                        st.caption("⏳ Graphs show the months processed so far and update as the rest finish.")
+                    if len(trend_results) < 2 and ingesting:
+                        st.info("⏳ The graphs appear once a second file has been processed.")
+                    elif len(trend_results) < 2:
+                        st.warning("Please upload a minimum of 2 files to enable comparison charts.")
+                    elif not selected_properties:
+                        st.warning("Please select at least one property.")
+                    else:
+                        from ..charts import chart_dataset, payload_bytes, property_chart_dataset, trend_bar_chart
+                        from ..store import MetricsStore
+
+                        recorder = current()
+                        recorder.lap_start()
+
+                        st.markdown("---")
+                        st.subheader("📈 Time-Based Comparison Graphs")
+
+                        # One long table (date x room type) shared by every chart, table and the export.
+                        # It lives in the session and is patched with only the months added or removed
+                        # since the last Generate, instead of being rebuilt from every file.
+                        trends_store, _, _ = st.session_state.get("trends_store", MetricsStore.empty()).sync(trend_results.values())
+                        st.session_state.trends_store = trends_store
+                        df_trends = trends_store.to_frame()
+                        recorder.lap("store sync")
+
+                        # The charts share one small table (period, room type, metrics); long
+                        # histories are bucketed into quarters or years to keep the payload flat.
+                        # Several properties are compared on their all-room-types totals instead.
+                        compare_properties = len(selected_properties) > 1
+                        if compare_properties:
+                            df_chart, chart_bucket = property_chart_dataset(trends_store, selected_properties, chart_grain)
+                        else:
+                            df_chart, chart_bucket = chart_dataset(
+                                trends_store, chart_grain, property_name=selected_properties[0] if trends_store.multi_property else None
+                            )
+                        # Measuring a chart serialises it again, so only do it for the diagnostics panel
+                        measure_payload = is_enabled()
+                        chart_payload = 0
+                        recorder.lap("chart data")
+
+                        # --- Generate the grouped bar charts using Altair ---
+                        # We need to explicitly define the grouping for side-by-side bars
+                        for trend_chart in TREND_CHARTS:
+                            metric = trend_chart["metric"]
+                            if df_chart.empty:
+                                st.info(f"No data available to plot {trend_chart['label']} trends.")
+                                continue
+                            if compare_properties:
+                                st.write(f"#### {trend_chart['label']} by Property Across Dates")
+                                chart = trend_bar_chart(
+                                    df_chart, metric, f"{trend_chart['label']} by Property Over Time", trend_chart["format"],
+                                    chart_bucket, x="Period", series="Property",
+                                )
+                            else:
+                                st.write(trend_chart["heading"])
+                                chart = trend_bar_chart(df_chart, metric, trend_chart["title"], trend_chart["format"], chart_bucket)
+                            if measure_payload:
+                                chart_payload += payload_bytes(chart)
+                            st.altair_chart(chart, use_container_width=True)
+                            recorder.lap("chart spec", metric)
+                        if measure_payload:
+                            recorder.count("chart payload bytes", chart_payload)
+
+                        if not df_chart.empty:
+                            bucket_note = "" if chart_bucket == "month" else f", bucketed by {chart_bucket}"
+                            st.caption(f"📦 Charts: {len(df_chart)} points each{bucket_note}, {chart_payload / 1024:.1f} KB in total.")
+
+                            # Precomputed with the store, so these are lookups rather than recomputed per rerun
+                            with st.expander(f"📅 {chart_bucket.capitalize()} rollups with year-over-year and period-over-period changes"):
+                                st.write("ADR is recomputed from the summed revenue and rentals; room percent is the average of the months.")
+                                if compare_properties:
+                                    st.write("All room types per property (room percent from each report's own totals, so unsold room types count):")
+                                    st.dataframe(trends_store.rollup_cube().property_table(chart_bucket, selected_properties), use_container_width=True, hide_index=True)
+                                st.dataframe(trends_store.rollup_cube().table(chart_bucket, selected_properties), use_container_width=True, hide_index=True)
+                            recorder.lap("rollups")
+
+                        # Every room type's series analysed in one batched pass, cached by the reports it holds
+                        source_key = tuple(sorted(trends_store.source_ids()))
+                        df_forecast, df_anomalies = trend_analytics(source_key, FORECAST_MONTHS, trends_store)
+                        if trends_store.multi_property:
+                            df_forecast = df_forecast[df_forecast["Property"].isin(selected_properties)]
+                            df_anomalies = df_anomalies[df_anomalies["Property"].isin(selected_properties)]
+                        if not df_forecast.empty:
+                            with st.expander(f"🔮 Occupancy and ADR forecast for the next {FORECAST_MONTHS} months"):
+                                st.write("Exponential smoothing of each room type's seasonally adjusted months; low and high give a 95% band.")
+                                st.dataframe(df_forecast, use_container_width=True, hide_index=True)
+                        with st.expander(f"🚩 Unusual months ({len(df_anomalies)})"):
+                            st.write(
+                                "Months far from the same month in other years (seasonal z) or, without another year "
+                                "to compare with, from the 12 months before them (rolling z)."
+                            )
+                            if df_anomalies.empty:
+                                st.write("No month stands out.")
+                            else:
+                                st.dataframe(df_anomalies, use_container_width=True, hide_index=True)
+                        recorder.lap("analytics")
+
+                        # Display and Download Summary Data for Multi-File Analysis
+                        # Only show download button if trend DataFrames have data
+                        if not df_trends.empty:
+                            st.markdown("---")
+                            st.subheader("⬇️ Download All Trends Data")
+
+                            # Display-friendly views of the long table: 'Date' (YYYY-MM), 'Room Type' and one metric
+                            dataframes_to_export_multi_file = trends_store.trend_sheets()
+
+                            # Optional: Display the DataFrames for user to preview
+                            with st.expander("🔍 Click to view detailed trend data tables"):
+                                for trend_chart, df_display in zip(TREND_CHARTS, dataframes_to_export_multi_file.values()):
+                                    st.write(trend_chart["table_heading"])
+                                    st.dataframe(df_display, use_container_width=True)
+                            recorder.lap("tables")
+
+                            from ..export import EXPORT_FILES
+
+                            # Built straight from the store's columns and cached by the reports it holds
+                            file_name, mime = EXPORT_FILES[download_format]
+                            export_bytes_multi_file = trends_export_bytes(source_key, download_format, trends_store)
+                            recorder.lap("export")
+
+                            st.download_button(
+                                label=f"⬇️ Download Multi-File Trends as .{download_format}",
+                                data=export_bytes_multi_file,
+                                file_name=file_name,
+                                mime=mime
+                            )
+                            if download_format == "xlsx":
+                                st.info("Click the button above to download a single Excel file with all trend data on separate sheets!")
+                            else:
+                                st.info("Click the button above to download all trend data.")
+                        else:
+                            st.info("Upload more files to generate downloadable trend data.")
+
+                elif not trend_results and not st.session_state.use_demo:
+                    st.info("Please upload Excel files or use the demo files to see the analysis.")
@@ -0,0 +1,116 @@
+"""Process-wide resources and cached helpers shared by the views."""
+
+import os
+
+import streamlit as st
+
+
+# File types the uploaders accept; room_pop.readers picks the reader from each
+# file's contents, so a renamed export still opens.
+UPLOAD_TYPES = ["xls", "xlsx", "csv", "parquet"]
+
+
+# --- Parse cache shared by every session of this server process ---
+# Reports are keyed by a hash of their bytes, so a rerun, a repeat upload or
+# another manager uploading the same month reuses the extracted metrics
+# instead of opening the workbook again.
+# Set ROOM_POP_CACHE_DIR to also keep them on disk across restarts,
+# ROOM_POP_CACHE_TTL (seconds) to expire them and ROOM_POP_CACHE_MAX_MB to cap memory.
+@st.cache_resource
+def get_parse_cache():
+    from ..cache import ParseCache
+
+    ttl = os.environ.get("ROOM_POP_CACHE_TTL")
+    return ParseCache(
+        max_entries=int(os.environ.get("ROOM_POP_CACHE_ENTRIES", "256")),
+        disk_dir=os.environ.get("ROOM_POP_CACHE_DIR"),
+        ttl=float(ttl) if ttl else None,
+        max_bytes=int(float(os.environ.get("ROOM_POP_CACHE_MAX_MB", "64")) * 2**20),
+    )
+
+
+# --- Background ingestion shared by every session of this server process ---
+# Uploaded batches are parsed on this pool rather than in the script, so a
+# rerun (any widget change) neither blocks on them nor starts them over; each
+# session keeps only the ids of its jobs.
+@st.cache_resource
+def get_ingest_jobs():
+    from ..jobs import IngestJobManager
+
+    return IngestJobManager()
+
+
+def load_report_metrics(data, filename=""):
+    from ..extract import read_report
+    from .diagnostics import current
+
+    recorder = current()
+
+    def parse(data):
+        timings = {}
+        metrics = read_report(data, timings=timings)
+        recorder.add("parse", timings["parse"], filename)
+        recorder.add("extract", timings["extract"], filename)
+        return metrics
+
+    return get_parse_cache().get_or_parse(data, parse=parse)
+
+
+# --- Optional local history of every ingested month ---
+# Set ROOM_POP_HISTORY_DB to a SQLite file path to keep months between sessions,
+# so trend analysis only needs the new months uploaded.
+@st.cache_resource
+def get_history_store():
+    path = os.environ.get("ROOM_POP_HISTORY_DB")
+    if not path:
+        return None
+    from ..history import HistoryStore
+
+    return HistoryStore(path)
+
+
+def save_to_history(results):
+    history = get_history_store()
+    if history is None or not results:
+        return
+    # A renamed file keeps its bytes but may move to another period, so the
+    # hash alone does not say whether this month is already saved
+    known = history.known_reports()
+    new_results = [
+        result for result in results
+        if (result.metrics.property_name, result.date, result.key) not in known
+    ]
+    if new_results:
+        history.upsert(new_results)
+        st.caption(f"💾 {len(new_results)} new month(s) saved to history.")
+
+
+# --- Function to convert DataFrames to an in-memory Excel file ---
+# Using st.cache_data to prevent re-generating the file
+# on every minor interaction if the data hasn't changed.
+@st.cache_data
+def to_excel_bytes(dfs_dict):
+    from ..export import excel_bytes
+
+    return excel_bytes(dfs_dict)
+
+
+# --- Trends export, keyed by the reports it was built from ---
+# The key is the (property, date, file hash) of every report in the store, so
+# Streamlit never has to hash the tables themselves; the leading underscore
+# keeps the store out of the cache key.
+@st.cache_data(max_entries=8)
+def trends_export_bytes(source_key, fmt, _store):
+    from ..export import trends_bytes
+
+    return trends_bytes(_store, fmt)
+
+
+# --- Seasonal baselines, unusual months and forecasts, keyed the same way ---
+# Every session looking at the same reports shares one analysis.
+@st.cache_data(max_entries=8)
+def trend_analytics(source_key, horizon, _store):
+    from ..analytics import SeriesAnalysis
+
+    analysis = SeriesAnalysis(_store)
+    return analysis.forecast(horizon), analysis.anomalies()
@@ -0,0 +1,184 @@
+"""Single Room Pop Excel File Analysis view."""
+
+import streamlit as st
+
+from .diagnostics import current
+from .resources import UPLOAD_TYPES, load_report_metrics, to_excel_bytes
+
+
+def render():
+
+    col1, col2, col3 = st.columns([1, 7, 1], gap="large")
+    with col2:
+
+        st.header("Single Room Pop Excel File Analysis")
+        st.markdown("---")  # Just a divider line for UX
+        # --------- FILE UPLOADER ---------
+        st.subheader("📥 Download file for analysis:")
+        st.write('')
+
+        # Handle file upload
+        uploaded_file = st.file_uploader("📄 Select Visual Matrix Output Excel File to Analyze", type=UPLOAD_TYPES)
+
+        # Handle demo file button
+        use_demo = st.button("📂 Use Demo File")
+
+        # Logic to handle file selection
+        if use_demo:
+            # Reset uploaded file state
+            st.session_state.uploaded_file = None
+            st.session_state.use_demo = True
+            st.session_state.generated_graph = None  # Reset the graph
+
+            # Load demo file
+            demo_data_path = "2024-02 Room_Type_Popularity.xls"
+            with open(demo_data_path, "rb") as fh:
+                st.session_state.uploaded_metrics_tab1 = load_report_metrics(fh.read(), demo_data_path)
+            st.success("✅ Demo file loaded!")
+
+        elif uploaded_file is not None:
+            # Reset demo file state
+            st.session_state.use_demo = False
+            st.session_state.uploaded_file = uploaded_file.name  # Keep the name only, not the file bytes
+            st.session_state.generated_graph = None  # Reset the graph
+            
+            # Load uploaded file
+            st.session_state.uploaded_metrics_tab1 = load_report_metrics(uploaded_file.getvalue(), uploaded_file.name)
+            st.success("✅ Excel file uploaded and stored!")
+
+        # Ensure only one file source is active
+        if st.session_state.uploaded_metrics_tab1 is not None:
+            st.info(
+                "Using the demo file." if st.session_state.use_demo
+                else "Using the uploaded file. Selecting the demo file will reset this option."
+            )
+            
+
+            if st.button("📊 Generate Graphs"):
+                # Reset the Excel bytes in session state
+                st.session_state.excel_bytes = None  # Clear the previous Excel file
+            
+                recorder = current()
+                recorder.lap_start()
+
+                import pandas as pd
+
+                metrics = st.session_state.uploaded_metrics_tab1
+
+                room_totals = metrics.by_room_type("rentals")
+
+                # List of room types and their corresponding rental counts
+                data_for_rent_totals_chart = {
+                    "Room Type": list(room_totals.keys()),
+                    "Total Rentals": list(room_totals.values())
+                }
+                #print(f'rent totals {rent_totals}')
+
+                # Now, convert this into a pandas DataFrame
+                rent_tot_chart_df = pd.DataFrame(data_for_rent_totals_chart)
+
+                pct_totals = metrics.by_room_type("percents")
+
+                data_for_rent_totals_chart = {
+                    "Room Type": list(room_totals.keys()),
+                    "Room Percents": list(pct_totals.values())
+                }
+                #print(f'rent totals {rent_totals}')
+
+                # Convert into a pandas DataFrame
+                room_pct_chart_df = pd.DataFrame(data_for_rent_totals_chart)
+
+
+
+                rev_totals = metrics.by_room_type("revenue")
+
+                data_for_rev_totals_chart = {
+                    "Room Type": list(room_totals.keys()),
+                    "Rev Totals": list(rev_totals.values())
+                }
+
+                # Convert into a pandas DataFrame
+                rev_totals_chart_df = pd.DataFrame(data_for_rev_totals_chart)
+
+
+
+                adr_totals = metrics.by_room_type("adr")
+
+                data_for_adr_totals_chart = {
+                    "Room Type": list(room_totals.keys()),
+                    "ADR Totals": list(adr_totals.values())
+                }
+
+                # Convert into a pandas DataFrame
+                adr_totals_chart_df = pd.DataFrame(data_for_adr_totals_chart)
+
+                totals = metrics.totals()
+
+                data_for_total_totals_chart = {
+                    "Category": list(totals.keys()),
+                    "Totals": list(totals.values())
+                }
+
+                # Convert this dictionary directly into a pandas DataFrame
+                total_totals_df = pd.DataFrame(data_for_total_totals_chart)
+
+                # Set 'Room Type' as the index if you prefer, then just add columns
+                combined_df = pd.DataFrame.from_dict(room_totals, orient='index', columns=['Total Rentals'])
+                combined_df['Room Percents'] = pd.Series(pct_totals)
+                combined_df['Total Revenue'] = pd.Series(rev_totals)
+                combined_df['ADR Totals'] = pd.Series(adr_totals)
+                combined_df.index.name = "Room Type" # Give the index a name if it's not a regular column
+                combined_df = combined_df.reset_index() # If you want "Room Type" to be a regular column again
+
+                recorder.lap("build tables")
+
+                col_left, col_right = st.columns([1, 1],  gap="large")
+
+                # Display the bar chart
+                with col_left:
+                    
+                    st.write("### Room Rentals by Type")
+                    st.bar_chart(rent_tot_chart_df, x="Room Type", y="Total Rentals")
+
+                    st.write("### Room Percents by Type")
+                    st.bar_chart(room_pct_chart_df, x="Room Type", y="Room Percents")
+
+                    # --- Displaying the Combined Table ---
+                    st.write("### All Room Data at a Glance")
+                    st.dataframe(combined_df)
+
+                with col_right:
+                    
+                    st.write("### Revenue Totals by Type")
+                    st.bar_chart(rev_totals_chart_df, x="Room Type", y="Rev Totals")
+
+                    # Display the bar chart using Streamlit!
+                    st.write("### Average Daily Rate by Type")
+                    st.bar_chart(adr_totals_chart_df, x="Room Type", y="ADR Totals")
+
+                    # --- Displaying the Table! ---
+                    st.write("### Summary Totals Table")
+                    st.dataframe(total_totals_df)
+
+                recorder.lap("charts")
+
+                # --- Prepare the DataFrames for export ---
+                # Create a dictionary where keys are the desired sheet names and values are the DataFrames
+                dataframes_to_export = {
+                    'Combined Room Data': combined_df,
+                    'Overall Totals Summary': total_totals_df # Changed sheet name for clarity
+                }
+
+                # Generate the Excel file in memory
+                excel_data_bytes = to_excel_bytes(dataframes_to_export)
+                recorder.lap("export")
+
+                # --- Display the Download Button ---
+                st.download_button(
+                    label="⬇️ Download Summary Data as Excel", # Text displayed on the button
+                    data=excel_data_bytes, # The actual bytes of the Excel file
+                    file_name="Room_Analysis_Report.xlsx", # The name of the file when downloaded
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" # The MIME type for .xlsx files
+                )
+
+                st.info("Click the button above to download your analysis data in a single Excel file!")